@@ -0,0 +1,183 @@
+# describerDaemon.py
+"""Optional description daemon for the WhatsApp Image Description add-on.
+
+Runs outside NVDA with any Python 3 that has the requests package, and owns the
+provider connections and the model catalog cache, so they stay warm across NVDA
+restarts and slow requests never run inside NVDA's process.
+
+Start it with:
+
+    python describerDaemon.py [--data-dir PATH]
+
+PATH is the add-on's data directory, whatsappImageDescriber in the NVDA user
+configuration folder (by default %APPDATA%\\nvda\\whatsappImageDescriber). The
+daemon authenticates clients with the key the add-on stores there.
+
+Protocol: multiprocessing.connection messages over a named pipe (a Unix socket
+elsewhere). Each request is one JSON message, followed by one raw message per
+image; each reply is one JSON message. Operations:
+
+    {"op": "ping"}
+    {"op": "get", "url": ..., "timeout": ..., "cacheSeconds": ...}
+    {"op": "post", "url": ..., "headers": {...}, "payload": {...}, "imageCount": n, "timeout": ...}
+    {"op": "echo", "imageCount": n}
+
+Replies carry "ok"; failed ones carry "error", successful post/get replies carry
+"status" and "json".
+"""
+import argparse
+import contextlib
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Listener
+
+from whatsappImageDescriberStreaming import StreamedJsonBody
+
+PROTOCOL_VERSION = 1
+PIPE_NAME = "whatsappImageDescriber"
+KEY_FILE = "daemon.key"
+MAX_CONCURRENT_REQUESTS = 4
+
+
+def daemonAddress():
+    """Return the address the daemon listens on for this platform."""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\{PIPE_NAME}"
+    return os.path.join(tempfile.gettempdir(), f"{PIPE_NAME}.sock")
+
+
+def defaultDataDir():
+    return os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "nvda", "whatsappImageDescriber")
+
+
+class DescriberDaemon(object):
+    """Serves provider requests for the add-on over an authenticated local connection."""
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        # Idle requests sessions; connections come and go per client call, each
+        # served on a new thread, so sessions are pooled rather than kept per thread
+        self._sessions = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        self._cacheLock = threading.Lock()
+        self._getCache = {}
+
+    @contextlib.contextmanager
+    def session(self):
+        """Borrow a pooled requests session, keeping its connections warm.
+
+        At most MAX_CONCURRENT_REQUESTS sessions are lent at a time, so the pool
+        never grows beyond that.
+        """
+        with self._slots:
+            try:
+                session = self._sessions.get_nowait()
+            except queue.Empty:
+                import requests
+                session = requests.Session()
+            try:
+                yield session
+            finally:
+                self._sessions.put(session)
+
+    def serveForever(self):
+        if not sys.platform == "win32" and os.path.exists(self.address):
+            os.unlink(self.address)
+        with Listener(self.address, authkey=self.authkey) as listener:
+            print(f"Description daemon listening on {self.address}", flush=True)
+            while True:
+                try:
+                    connection = listener.accept()
+                except Exception as e:
+                    print(f"Rejected connection: {e}", flush=True)
+                    continue
+                threading.Thread(target=self.handle, args=(connection,), daemon=True).start()
+
+    def handle(self, connection):
+        """Answer requests on one connection until the client closes it."""
+        with connection:
+            while True:
+                try:
+                    request = json.loads(connection.recv_bytes())
+                    images = [connection.recv_bytes() for i in range(request.get("imageCount", 0))]
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = self.dispatch(request, images)
+                except Exception as e:
+                    reply = {"ok": False, "error": str(e)}
+                connection.send_bytes(json.dumps(reply).encode("utf-8"))
+
+    def dispatch(self, request, images):
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "version": PROTOCOL_VERSION}
+        if op == "echo":
+            return {"ok": True, "bytes": sum(len(image) for image in images)}
+        if op == "get":
+            return self.get(request)
+        if op == "post":
+            return self.post(request, images)
+        return {"ok": False, "error": f"Unknown operation {op}"}
+
+    def get(self, request):
+        """GET a URL, serving repeated requests from cache for cacheSeconds."""
+        url = request["url"]
+        now = time.monotonic()
+        with self._cacheLock:
+            cached = self._getCache.get(url)
+        if cached and now - cached[0] < request.get("cacheSeconds", 0):
+            return dict(cached[1], cached=True)
+        with self.session() as session:
+            response = session.get(url, timeout=request.get("timeout", 10))
+        reply = {"ok": True, "status": response.status_code, "json": response.json()}
+        if response.status_code == 200:
+            with self._cacheLock:
+                self._getCache[url] = (now, reply)
+        return reply
+
+    def post(self, request, images):
+        """POST a JSON payload with streamed images.
+
+        Answers are never cached: describing an image again must ask the model again.
+        """
+        body = StreamedJsonBody(request["payload"], images)
+        start = time.perf_counter()
+        with self.session() as session:
+            response = session.post(
+                request["url"],
+                headers=request["headers"],
+                data=body,
+                timeout=request.get("timeout", 30)
+            )
+            data = response.json()
+        return {
+            "ok": True,
+            "status": response.status_code,
+            "json": data,
+            "bytes": len(body),
+            "seconds": time.perf_counter() - start
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Description daemon for the WhatsApp Image Description add-on")
+    parser.add_argument("--data-dir", default=defaultDataDir(), help="the add-on's data directory")
+    args = parser.parse_args()
+    keyPath = os.path.join(args.data_dir, KEY_FILE)
+    try:
+        with open(keyPath, "rb") as f:
+            authkey = f.read().strip()
+    except FileNotFoundError:
+        sys.exit(f"No key at {keyPath}. Enable the daemon in the add-on settings first.")
+    DescriberDaemon(daemonAddress(), authkey).serveForever()
+
+
+if __name__ == "__main__":
+    main()
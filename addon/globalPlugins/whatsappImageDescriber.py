@@ -1,5 +1,6 @@
 # globalPlugins/whatsappImageDescriber/__init__.py
 import os
+import sys
 import tempfile
 import base64
 import json
@@ -18,10 +19,36 @@ import mouseHandler
 import winUser
 import requests
 import io
+import math
+import collections
+import bisect
+import mmap
+import shutil
+import cProfile
+import functools
+import pstats
+import traceback
 import time
+import datetime
+import tracemalloc
+import statistics
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client
+import globalVars
 import gui
 from gui import settingsDialogs, guiHelper
 
+# Modules shared with the description daemon live in the add-on's root folder, which
+# is only on sys.path while they are imported
+_addonDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _addonDir)
+try:
+    from whatsappImageDescriberStreaming import StreamedJsonBody, imagePlaceholder
+finally:
+    sys.path.remove(_addonDir)
+
 # Configuration specification with separate API keys for each service
 SPEC = {
     'openaiApiKey': 'string(default="")',
@@ -31,56 +58,924 @@ SPEC = {
     'apiService': 'string(default="openai")',  # Options: openai, openrouter, claude
     'selectedModel': 'string(default="")',
     'maxTokens': 'integer(default=300)',
-    'language': 'string(default="English")'
+    'language': 'string(default="English")',
+    'autoCrop': 'boolean(default=False)',
+    'stallThresholdMs': 'integer(default=150)',
+    'useDaemon': 'boolean(default=False)',
+    'recordCorpus': 'boolean(default=False)',
+    'collectPackDescriptions': 'boolean(default=False)',
+    'benchmarkModels': 'string(default="")'  # Comma separated OpenRouter model IDs
+}
+
+# Description languages offered in the settings panel
+LANGUAGES = [
+    "English",
+    "Spanish",
+    "French",
+    "German",
+    "Italian",
+    "Portuguese",
+    "Russian",
+    "Japanese",
+    "Chinese",
+    "Arabic"
+]
+
+# Service IDs and their names in the user interface
+SERVICE_NAMES = {
+    "openai": "OpenAI (GPT-4 Vision)",
+    "openrouter": "OpenRouter",
+    "claude": "Anthropic Claude"
 }
 
 # Model options by service
 MODEL_OPTIONS = {
-    "openai": ["gpt-4-vision-preview", "gpt-4o"],
-    "openrouter": [],  # Will be populated dynamically
-    "claude": ["claude-3-7-sonnet-20250219", "claude-3-opus-20240229", "claude-3-sonnet-20240229", "claude-3-haiku-20240307"]
+    # Replaced by the providers' listings once fetched
+    "openai": ["gpt-4o", "gpt-4.1"],
+    "openrouter": [],
+    "claude": ["claude-sonnet-4-5", "claude-haiku-4-5"]
 }
 
+def benchmarkPayloadMemory(imageSize=4 * 1024 * 1024):
+    """Measure peak memory per request for buffered and streamed request bodies.
+
+    Meant to be run from the NVDA Python console. The buffered case mirrors what
+    requests.post(json=...) used to build: a base64 str, the payload dict holding it,
+    the JSON str and its UTF-8 bytes. The streamed case reads a StreamedJsonBody in
+    the block size urllib3 uses. Returns a dict of tracemalloc peaks in bytes.
+    """
+    image = os.urandom(imageSize)
+
+    def makePayload(imageUrl):
+        return {
+            "model": "benchmark",
+            "messages": [{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": "Describe this image in detail."},
+                    {"type": "image_url", "image_url": {"url": imageUrl}}
+                ]
+            }],
+            "max_tokens": 300
+        }
+
+    def buffered():
+        encoded = base64.b64encode(image).decode('utf-8')
+        payload = makePayload(f"data:image/png;base64,{encoded}")
+        body = json.dumps(payload).encode('utf-8')
+        return len(body)
+
+    def streamed():
+        body = StreamedJsonBody(makePayload(imagePlaceholder(0, "data:image/png;base64,")), [image])
+        total = 0
+        while True:
+            block = body.read(16384)
+            if not block:
+                break
+            total += len(block)
+        return total
+
+    results = {}
+    wasTracing = tracemalloc.is_tracing()
+    if not wasTracing:
+        tracemalloc.start()
+    try:
+        for name, func in (("buffered", buffered), ("streamed", streamed)):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            bodyLength = func()
+            results[name] = tracemalloc.get_traced_memory()[1] - baseline
+            log.info(f"{name} request body: {bodyLength} bytes, peak memory {results[name]} bytes")
+    finally:
+        if not wasTracing:
+            tracemalloc.stop()
+    return results
+
+def dataPath(*names):
+    """Return a path inside the add-on's data directory, creating its parent folders.
+
+    The data directory is whatsappImageDescriber in the NVDA user configuration.
+    """
+    path = os.path.join(globalVars.appArgs.configPath, "whatsappImageDescriber", *names)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def makeTestPng(width=256, height=256, seed=0):
+    """Build a deterministic RGB pattern as PNG data, without needing wx."""
+    rows = []
+    for y in range(height):
+        row = bytearray(1)  # Filter type 0
+        for x in range(width):
+            row += bytes(((x * 255) // width, (y * 255) // height, ((x ^ y) + seed) & 0xFF))
+        rows.append(bytes(row))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(b"".join(rows)))
+        + chunk(b"IEND", b"")
+    )
+
+# Main thread stall watchdog
+PROFILE_INVOCATION_COUNT = 5
+PROFILES_DIR = "profiles"
+
+class MainThreadWatchdog(object):
+    """Measures how long plugin entry points block NVDA's main thread.
+
+    Each measured call on the main thread arms a timer. If the call is still running
+    when the stallThresholdMs setting passes, the main thread's stack is logged, so
+    the code that freezes speech can be found. Once profiling is requested, the next
+    calls also run under cProfile and their statistics are written to the profiles
+    folder of the add-on's data directory. Measured calls made from inside another
+    one, such as a sampler started by a script, are left to the outer measurement,
+    since only one profiler can run at a time.
+    """
+
+    def __init__(self):
+        self.profileRemaining = 0
+        self._lock = threading.Lock()
+        self._active = threading.local()
+
+    def profileNext(self, count=PROFILE_INVOCATION_COUNT):
+        """Profile the next count measured calls."""
+        with self._lock:
+            self.profileRemaining = count
+
+    def _takeProfileSlot(self):
+        with self._lock:
+            if self.profileRemaining <= 0:
+                return False
+            self.profileRemaining -= 1
+            return True
+
+    def call(self, name, func, *args, **kwargs):
+        """Call func, measuring it if it runs on the main thread."""
+        if threading.current_thread() is not threading.main_thread() or getattr(self._active, 'measuring', False):
+            return func(*args, **kwargs)
+        threshold = config.conf['WhatsAppImageDescription']['stallThresholdMs'] / 1000
+        timer = threading.Timer(threshold, self._reportStall, args=(name, threading.get_ident(), threshold))
+        timer.daemon = True
+        profiler = cProfile.Profile() if self._takeProfileSlot() else None
+        start = time.perf_counter()
+        timer.start()
+        self._active.measuring = True
+        try:
+            if profiler:
+                return profiler.runcall(func, *args, **kwargs)
+            return func(*args, **kwargs)
+        finally:
+            self._active.measuring = False
+            elapsed = time.perf_counter() - start
+            timer.cancel()
+            if elapsed >= threshold:
+                log.warning(f"{name} blocked the main thread for {elapsed * 1000:.0f} ms")
+            else:
+                log.debug(f"{name} blocked the main thread for {elapsed * 1000:.0f} ms")
+            if profiler:
+                self._saveProfile(name, profiler)
+
+    def _reportStall(self, name, threadId, threshold):
+        frame = sys._current_frames().get(threadId)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame))
+        log.warning(f"{name} has blocked the main thread for over {threshold * 1000:.0f} ms, at:\n{stack}")
+
+    def _saveProfile(self, name, profiler):
+        try:
+            path = dataPath(PROFILES_DIR, f"{name}-{int(time.time() * 1000)}.prof")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            profiler.dump_stats(path)
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(15)
+            log.info(f"Profile of {name} written to {path}\n{summary.getvalue()}")
+        except Exception as e:
+            log.error(f"Error saving profile: {e}")
+
+watchdog = MainThreadWatchdog()
+
+def measureMainThread(func):
+    """Decorate a plugin entry point so the watchdog measures it."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return watchdog.call(func.__qualname__, func, *args, **kwargs)
+    return wrapper
+
+def describePrompt(language=None):
+    """Return the prompt used to describe a single image."""
+    language = language or config.conf['WhatsAppImageDescription']['language']
+    return f"Describe this image in detail. If the image contain text, extract the exact text  from the image after a brief description. Use {language} language."
+
+def sequencePrompt(language=None):
+    """Return the prompt used to describe keyframes sampled from an animation or video."""
+    language = language or config.conf['WhatsAppImageDescription']['language']
+    return (
+        "These images are keyframes, in order, sampled from a short animation or video. "
+        "Describe this sequence: what is shown and how it moves or changes over time. "
+        "If the frames contain text, extract the exact text after the description. "
+        f"Use {language} language."
+    )
+
+def followUpPrompt(question, language=None):
+    """Return the prompt for a follow-up question about an already described image."""
+    language = language or config.conf['WhatsAppImageDescription']['language']
+    return f"{question}\nAnswer about the same image. Use {language} language."
+
+def serviceApiKey(service):
+    """Return the configured API key for a service, or an empty string."""
+    if service == "openai":
+        return config.conf['WhatsAppImageDescription']['openaiApiKey']
+    elif service == "openrouter":
+        return config.conf['WhatsAppImageDescription']['openrouterApiKey']
+    elif service == "claude":
+        return config.conf['WhatsAppImageDescription']['claudeApiKey']
+    return ""
+
+# Optional out-of-process description daemon (addon/describerDaemon.py)
+DAEMON_PIPE_NAME = "whatsappImageDescriber"
+DAEMON_KEY_FILE = "daemon.key"
+# How long the model catalog is served from the daemon's cache
+DAEMON_CATALOG_CACHE_SECONDS = 6 * 60 * 60
+
+class DaemonUnavailable(Exception):
+    """Raised when the description daemon cannot be reached."""
+
+class DaemonRequestError(Exception):
+    """Raised when the daemon took a request but it failed, for example at the provider.
+
+    The request may already have reached the provider, so it is not sent again.
+    """
+
+class DaemonClient(object):
+    """Talks to the description daemon over its local pipe.
+
+    Each call opens a short-lived authenticated connection, sends one JSON request
+    followed by the raw images and reads one JSON reply. Failing to reach the daemon
+    or to hand it the request raises DaemonUnavailable, so callers can fall back to
+    in-process requests. Once the daemon has the request, failures raise
+    DaemonRequestError instead.
+    """
+
+    def address(self):
+        if sys.platform == "win32":
+            return rf"\\.\pipe\{DAEMON_PIPE_NAME}"
+        return os.path.join(tempfile.gettempdir(), f"{DAEMON_PIPE_NAME}.sock")
+
+    def authkey(self):
+        """Return the shared key, creating it on first use."""
+        path = dataPath(DAEMON_KEY_FILE)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(os.urandom(32).hex().encode('ascii'))
+        with open(path, "rb") as f:
+            return f.read().strip()
+
+    def call(self, request, images=()):
+        """Send one request and return the daemon's reply."""
+        request = dict(request, imageCount=len(images))
+        try:
+            connection = Client(self.address(), authkey=self.authkey())
+        except Exception as e:
+            raise DaemonUnavailable(str(e))
+        with connection:
+            try:
+                connection.send_bytes(json.dumps(request).encode('utf-8'))
+                for image in images:
+                    connection.send_bytes(image)
+            except (EOFError, OSError) as e:
+                raise DaemonUnavailable(str(e))
+            try:
+                reply = json.loads(connection.recv_bytes())
+            except (EOFError, OSError) as e:
+                raise DaemonRequestError(f"The description daemon did not answer: {e}")
+        if not reply.get("ok"):
+            raise DaemonRequestError(reply.get("error", "Request failed"))
+        return reply
+
+daemonClient = DaemonClient()
+
+def useDaemon():
+    return config.conf['WhatsAppImageDescription']['useDaemon']
+
+def benchmarkDaemonOverhead(imageSize=1024 * 1024, rounds=20):
+    """Measure the round trip cost of the daemon's IPC.
+
+    Meant to be run from the NVDA Python console while the daemon is running. Times an
+    empty ping and the transfer of an image of imageSize bytes, and compares the latter
+    with copying the same bytes in process. Returns median milliseconds per call.
+    """
+    image = os.urandom(imageSize)
+
+    def median(func):
+        samples = []
+        for i in range(rounds):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    results = {
+        "ping": median(lambda: daemonClient.call({"op": "ping"})),
+        "echo": median(lambda: daemonClient.call({"op": "echo"}, [image])),
+        "inProcessCopy": median(lambda: bytes(bytearray(image)))
+    }
+    log.info(f"Daemon IPC overhead for a {imageSize} byte image, median ms: {results}")
+    return results
+
+# Size in bytes and duration in seconds of the last request sent from each thread
+requestStats = threading.local()
+
+def postJson(url, headers, payload, images, timeout=30):
+    """POST payload as a streamed JSON body and return the parsed JSON response.
+
+    The request goes through the description daemon when it is enabled and running,
+    and is sent in process otherwise. Requests the daemon took but could not complete
+    raise DaemonRequestError rather than being sent a second time. The body size and round trip time are
+    recorded in requestStats for the calling thread.
+    """
+    if useDaemon():
+        start = time.perf_counter()
+        try:
+            reply = daemonClient.call(
+                {"op": "post", "url": url, "headers": headers, "payload": payload, "timeout": timeout},
+                images
+            )
+            requestStats.bytes = reply.get("bytes")
+            requestStats.seconds = time.perf_counter() - start
+            log.info(
+                f"Request to {url} through the daemon: {requestStats.bytes} bytes in {requestStats.seconds:.2f} s"
+            )
+            return reply["json"]
+        except DaemonUnavailable as e:
+            log.info(f"Description daemon unavailable, sending in process: {e}")
+    body = StreamedJsonBody(payload, images)
+    start = time.perf_counter()
+    response = requests.post(url, headers=headers, data=body, timeout=timeout)
+    response_data = response.json()
+    requestStats.bytes = len(body)
+    requestStats.seconds = time.perf_counter() - start
+    log.info(f"Request to {url}: {requestStats.bytes} bytes in {requestStats.seconds:.2f} s")
+    return response_data
+
+def conversationTurns(history, prompt):
+    """Return the earlier turns followed by a new user turn holding prompt."""
+    return list(history or []) + [{"role": "user", "text": prompt or describePrompt()}]
+
+def chatMessages(turns, imageCount):
+    """Build OpenAI style chat messages; the images belong to the first user turn."""
+    messages = []
+    for index, turn in enumerate(turns):
+        if turn["role"] != "user":
+            messages.append({"role": turn["role"], "content": turn["text"]})
+            continue
+        content = [{"type": "text", "text": turn["text"]}]
+        if index == 0:
+            content += [
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": imagePlaceholder(i, "data:image/png;base64,")
+                    }
+                }
+                for i in range(imageCount)
+            ]
+        messages.append({"role": "user", "content": content})
+    return messages
+
+def claudeMessages(turns, imageCount, fileIds=None):
+    """Build Claude messages; the images belong to the first user turn.
+
+    Images refer to uploaded files when fileIds are given and are sent inline otherwise.
+    Only follow-up questions use files, so only file images are marked for prompt
+    caching; the inline first request is never sent again to read the cache.
+    """
+    messages = []
+    for index, turn in enumerate(turns):
+        if turn["role"] != "user":
+            messages.append({"role": turn["role"], "content": turn["text"]})
+            continue
+        content = [{"type": "text", "text": turn["text"]}]
+        if index == 0:
+            for i in range(imageCount):
+                if fileIds:
+                    source = {"type": "file", "file_id": fileIds[i]}
+                else:
+                    source = {"type": "base64", "media_type": "image/png", "data": imagePlaceholder(i)}
+                content.append({"type": "image", "source": source})
+            if imageCount and fileIds:
+                content[-1]["cache_control"] = {"type": "ephemeral"}
+        messages.append({"role": "user", "content": content})
+    return messages
+
+CLAUDE_FILES_BETA = "files-api-2025-04-14"
+
+def claudeFilesHeaders(api_key):
+    """Return the request headers for the Claude Files API."""
+    return {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "anthropic-beta": CLAUDE_FILES_BETA
+    }
+
+def uploadClaudeFiles(images, api_key):
+    """Upload images to the Claude Files API and return their file IDs.
+
+    Returns an empty list when any upload fails, in which case images are sent inline
+    and the images already uploaded are deleted again. The bytes uploaded and the time
+    taken are recorded in requestStats as uploadBytes and uploadSeconds.
+    """
+    fileIds = []
+    start = time.perf_counter()
+    requestStats.uploadBytes = 0
+    try:
+        for index, image in enumerate(images):
+            response = requests.post(
+                "https://api.anthropic.com/v1/files",
+                headers=claudeFilesHeaders(api_key),
+                files={"file": (f"whatsapp-image-{index}.png", image, "image/png")},
+                timeout=30
+            )
+            response_data = response.json()
+            if 'id' not in response_data:
+                log.error(f"Claude file upload failed: {response_data.get('error', response_data)}")
+                deleteClaudeFiles(fileIds, api_key)
+                return []
+            fileIds.append(response_data['id'])
+            requestStats.uploadBytes += len(image)
+        requestStats.uploadSeconds = time.perf_counter() - start
+        log.info(
+            f"Uploaded {len(fileIds)} images to the Claude Files API: "
+            f"{requestStats.uploadBytes} bytes in {requestStats.uploadSeconds:.2f} s"
+        )
+    except Exception as e:
+        log.error(f"Claude file upload error: {e}")
+        deleteClaudeFiles(fileIds, api_key)
+        return []
+    return fileIds
+
+def deleteClaudeFiles(fileIds, api_key):
+    """Delete uploaded images from the Claude Files API, logging any that remain."""
+    for fileId in fileIds:
+        try:
+            response = requests.delete(
+                f"https://api.anthropic.com/v1/files/{fileId}",
+                headers=claudeFilesHeaders(api_key),
+                timeout=10
+            )
+            if response.status_code not in (200, 204, 404):
+                log.error(f"Could not delete Claude file {fileId}: HTTP {response.status_code}")
+        except Exception as e:
+            log.error(f"Could not delete Claude file {fileId}: {e}")
+
+class DescriptionError(Exception):
+    """Raised when a service gives no description; the message is shown to the user."""
+
+class Conversation(object):
+    """The last described image and the questions and answers about it so far.
+
+    Follow-up questions go to the same service and model, in the same language, as
+    the first request. requestBytes and requestSeconds describe that first request,
+    for comparison.
+    """
+
+    def __init__(self, service, model, language, images, prompt, answer, requestBytes, requestSeconds):
+        self.service = service
+        self.model = model
+        self.language = language
+        self.images = images
+        self.requestBytes = requestBytes
+        self.requestSeconds = requestSeconds
+        self.turns = []
+        # Claude Files API IDs; None until the first follow-up, empty if the upload failed
+        self.fileIds = None
+        self.closed = False
+        self.addExchange(prompt, answer)
+
+    def addExchange(self, prompt, answer):
+        self.turns.append({"role": "user", "text": prompt})
+        self.turns.append({"role": "assistant", "text": answer})
+
+    def close(self, wait=False):
+        """End the conversation, deleting any images uploaded for it.
+
+        The deletion runs on a background thread unless wait is true.
+        """
+        self.closed = True
+        fileIds, self.fileIds = self.fileIds, []
+        if not fileIds:
+            return
+        apiKey = serviceApiKey("claude")
+        if wait:
+            deleteClaudeFiles(fileIds, apiKey)
+        else:
+            threading.Thread(target=deleteClaudeFiles, args=(fileIds, apiKey), daemon=True).start()
+
+# Recent captures kept in memory so they can be described again without recapturing
+CAPTURE_HISTORY_SIZE = 5
+CAPTURE_HISTORY_BYTES = 16 * 1024 * 1024
+# OpenRouter models offered in the re-describe menu
+RESUBMIT_OPENROUTER_MODELS = 15
+
+class CaptureHistory(object):
+    """A bounded ring buffer of recent captures, newest last.
+
+    At most maxEntries captures and maxBytes of image data are kept; the oldest
+    captures are dropped first. A single capture larger than maxBytes is not kept.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, maxEntries=CAPTURE_HISTORY_SIZE, maxBytes=CAPTURE_HISTORY_BYTES):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self._entries = collections.deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, images, sequence=False):
+        """Remember a capture. sequence marks keyframes of an animation."""
+        size = sum(len(image) for image in images)
+        if size > self.maxBytes:
+            log.info(f"Capture of {size} bytes is too large to keep for re-describing")
+            return
+        with self._lock:
+            self._entries.append({"images": images, "sequence": sequence, "bytes": size, "time": time.time()})
+            self._bytes += size
+            while len(self._entries) > self.maxEntries or self._bytes > self.maxBytes:
+                self._bytes -= self._entries.popleft()["bytes"]
+
+    def latest(self):
+        """Return the most recent capture, or None."""
+        with self._lock:
+            return self._entries[-1] if self._entries else None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+# Description packs: shared, precomputed descriptions of common images such as
+# stickers and memes, looked up by image fingerprint before any network call.
+PACK_MAGIC = b"WIDPACK2"
+PACK_EXTENSION = ".widp"
+PACKS_DIR = "packs"
+PACK_HEADER = struct.Struct("<8sIH")
+# Side of the greyscale thumbnail that confirms a fingerprint match
+PACK_CHECK_SIZE = 16
+# Fingerprint, description offset, description length and check thumbnail
+PACK_RECORD = struct.Struct(f"<QII{PACK_CHECK_SIZE * PACK_CHECK_SIZE}s")
+# Fingerprints with fewer set or unset bits than this come from plain or smooth
+# images, such as blank backgrounds and text screenshots, and identify nothing
+PACK_MIN_HASH_BITS = 12
+# Largest mean difference between check thumbnails of the same image
+PACK_CHECK_TOLERANCE = 10
+CONTRIBUTIONS_FILE = "packContributions.json"
+CONTRIBUTIONS_PER_LANGUAGE = 500
+# Only descriptions of images seen at least this often are exported
+EXPORT_MIN_SIGHTINGS = 2
+
+def difference_hash(pixels, width=9, height=8):
+    """Return the 64-bit difference hash of a width x height greyscale thumbnail."""
+    value = 0
+    for y in range(height):
+        row = y * width
+        for x in range(width - 1):
+            value = (value << 1) | (pixels[row + x] > pixels[row + x + 1])
+    return value
+
+def image_fingerprint(image_data):
+    """Return (fingerprint, check) for PNG data, or None if the image is too plain.
+
+    fingerprint is a 64-bit difference hash that survives small scaling changes and
+    is used to find candidates. check is a small greyscale thumbnail that confirms a
+    candidate really is the same image.
+    """
+    image = wx.Image(io.BytesIO(image_data), wx.BITMAP_TYPE_PNG)
+    thumb = image.Scale(9, 8, wx.IMAGE_QUALITY_BOX_AVERAGE).ConvertToGreyscale()
+    fingerprint = difference_hash(bytes(thumb.GetData())[::3])
+    bits = bin(fingerprint).count("1")
+    if bits < PACK_MIN_HASH_BITS or bits > 64 - PACK_MIN_HASH_BITS:
+        return None
+    check = image.Scale(PACK_CHECK_SIZE, PACK_CHECK_SIZE, wx.IMAGE_QUALITY_BOX_AVERAGE).ConvertToGreyscale()
+    return fingerprint, bytes(check.GetData())[::3]
+
+def checks_match(check, other):
+    """Return whether two check thumbnails show the same image."""
+    if len(check) != len(other):
+        return False
+    return sum(abs(a - b) for a, b in zip(check, other)) <= PACK_CHECK_TOLERANCE * len(check)
+
+def write_description_pack(path, language, descriptions):
+    """Write a description pack for one language.
+
+    descriptions is a list of ((fingerprint, check), text) pairs. The pack holds a
+    header, the records sorted by fingerprint, then the UTF-8 descriptions.
+    """
+    languageData = language.encode('utf-8')
+    records = []
+    texts = []
+    offset = 0
+    for (fingerprint, check), description in sorted(descriptions):
+        text = description.encode('utf-8')
+        records.append(PACK_RECORD.pack(fingerprint, offset, len(text), check))
+        texts.append(text)
+        offset += len(text)
+    with open(path, "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, len(records), len(languageData)))
+        f.write(languageData)
+        f.writelines(records)
+        f.writelines(texts)
+
+class _PackFingerprints(object):
+    """Sequence view of the sorted fingerprints of a mapped pack, for bisect."""
+
+    def __init__(self, buffer, start, count):
+        self._buffer = buffer
+        self._start = start
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return PACK_RECORD.unpack_from(self._buffer, self._start + index * PACK_RECORD.size)[0]
+
+class DescriptionPack(object):
+    """A read-only, memory-mapped description pack.
+
+    Lookups binary search the sorted fingerprint records in place, so opening a
+    pack costs nothing beyond the mapping and each lookup touches a few pages.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.count, languageLength = PACK_HEADER.unpack_from(self._map, 0)
+            if magic != PACK_MAGIC:
+                raise ValueError(f"{path} is not a description pack, or was made by an older version of the add-on")
+            languageEnd = PACK_HEADER.size + languageLength
+            self.language = self._map[PACK_HEADER.size:languageEnd].decode('utf-8')
+            self._textStart = languageEnd + self.count * PACK_RECORD.size
+            if self._textStart > len(self._map):
+                raise ValueError(f"{path} is truncated")
+            self._fingerprints = _PackFingerprints(self._map, languageEnd, self.count)
+            self._recordStart = languageEnd
+        except Exception:
+            self.close()
+            raise
+
+    def lookup(self, fingerprint, check):
+        """Return the description stored for fingerprint whose check matches, or None."""
+        index = bisect.bisect_left(self._fingerprints, fingerprint)
+        while index < self.count:
+            found, offset, length, storedCheck = PACK_RECORD.unpack_from(
+                self._map, self._recordStart + index * PACK_RECORD.size
+            )
+            if found != fingerprint:
+                return None
+            if checks_match(check, storedCheck):
+                start = self._textStart + offset
+                return self._map[start:start + length].decode('utf-8')
+            index += 1
+        return None
+
+    def items(self):
+        """Yield ((fingerprint, check), description) for every entry."""
+        for index in range(self.count):
+            fingerprint, offset, length, check = PACK_RECORD.unpack_from(
+                self._map, self._recordStart + index * PACK_RECORD.size
+            )
+            start = self._textStart + offset
+            yield (fingerprint, check), self._map[start:start + length].decode('utf-8')
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+class DescriptionPackLibrary(object):
+    """The imported description packs and the descriptions this installation can share.
+
+    Lookups accept fingerprints one bit away from a stored one, which absorbs the
+    small rendering differences between installations, and confirm each candidate
+    against its check thumbnail. When the collectPackDescriptions setting is on,
+    descriptions received from a provider are remembered per language, with how
+    often each image was seen, so that recurring images can be exported as a pack
+    for others. Fingerprints are the
+    (fingerprint, check) pairs returned by image_fingerprint.
+    """
+
+    def __init__(self):
+        self._packs = None
+        self._contributions = None
+        self._lock = threading.Lock()
+
+    def _loadPacks(self):
+        packs = []
+        directory = dataPath(PACKS_DIR)
+        os.makedirs(directory, exist_ok=True)
+        for name in sorted(os.listdir(directory)):
+            if not name.lower().endswith(PACK_EXTENSION):
+                continue
+            try:
+                packs.append(DescriptionPack(os.path.join(directory, name)))
+            except Exception as e:
+                log.error(f"Error opening description pack {name}: {e}")
+        log.info(f"Loaded {len(packs)} description packs")
+        return packs
+
+    def packs(self):
+        with self._lock:
+            if self._packs is None:
+                self._packs = self._loadPacks()
+            return self._packs
+
+    def lookup(self, fingerprint, language):
+        """Return a packed description of the image in language, or None."""
+        fingerprint, check = fingerprint
+        candidates = [fingerprint] + [fingerprint ^ (1 << bit) for bit in range(64)]
+        for pack in self.packs():
+            if pack.language != language:
+                continue
+            for candidate in candidates:
+                description = pack.lookup(candidate, check)
+                if description is not None:
+                    return description
+        return None
+
+    def importPack(self, path):
+        """Copy a pack into the packs folder and return its number of entries."""
+        pack = DescriptionPack(path)
+        count = pack.count
+        pack.close()
+        destination = dataPath(PACKS_DIR, os.path.basename(path))
+        # Mapped packs cannot be overwritten on Windows
+        self.close()
+        if os.path.abspath(path) != os.path.abspath(destination):
+            shutil.copyfile(path, destination)
+        return count
+
+    def close(self):
+        with self._lock:
+            for pack in self._packs or []:
+                pack.close()
+            self._packs = None
+
+    def _loadContributions(self):
+        if self._contributions is None:
+            try:
+                with open(dataPath(CONTRIBUTIONS_FILE), "r", encoding="utf-8") as f:
+                    self._contributions = json.load(f)
+            except FileNotFoundError:
+                self._contributions = {}
+            except Exception as e:
+                log.error(f"Error reading description pack contributions: {e}")
+                self._contributions = {}
+        return self._contributions
+
+    def remember(self, fingerprint, language, description):
+        """Record a provider description so recurring images can be exported.
+
+        An image whose fingerprint is already recorded for a different image replaces
+        that entry rather than adding to its count.
+        """
+        fingerprint, check = fingerprint
+        with self._lock:
+            entries = self._loadContributions().setdefault(language, {})
+            key = f"{fingerprint:016x}"
+            entry = entries.pop(key, None)
+            if not entry or "check" not in entry or not checks_match(check, bytes.fromhex(entry["check"])):
+                entry = {"count": 0, "check": check.hex()}
+            entry["count"] += 1
+            entry["text"] = description
+            # Re-inserting keeps the dict in least recently seen order
+            entries[key] = entry
+            while len(entries) > CONTRIBUTIONS_PER_LANGUAGE:
+                del entries[next(iter(entries))]
+            try:
+                with open(dataPath(CONTRIBUTIONS_FILE), "w", encoding="utf-8") as f:
+                    json.dump(self._contributions, f)
+            except Exception as e:
+                log.error(f"Error saving description pack contributions: {e}")
+
+    def forget(self):
+        """Delete all remembered descriptions and return how many there were."""
+        with self._lock:
+            count = sum(len(entries) for entries in self._loadContributions().values())
+            self._contributions = {}
+            try:
+                os.remove(dataPath(CONTRIBUTIONS_FILE))
+            except FileNotFoundError:
+                pass
+        return count
+
+    def exportPack(self, path, language):
+        """Write the recurring descriptions in language to a pack; return how many."""
+        with self._lock:
+            entries = self._loadContributions().get(language, {})
+            descriptions = [
+                ((int(key, 16), bytes.fromhex(entry["check"])), entry["text"])
+                for key, entry in entries.items()
+                if entry["count"] >= EXPORT_MIN_SIGHTINGS and "check" in entry
+            ]
+        write_description_pack(path, language, descriptions)
+        return len(descriptions)
+
+descriptionPacks = DescriptionPackLibrary()
+
+def parseOpenRouterCatalog(data):
+    """Extract vision model IDs and their capability entries from the OpenRouter catalog.
+
+    Returns (models, capabilities) where models is the sorted list of vision model IDs
+    and capabilities maps each of them to its capability index entry.
+    """
+    models = []
+    capabilities = {}
+    
+    if 'data' in data:
+        for model in data['data']:
+            # Check if the model supports image input
+            # Based on OpenRouter docs: architecture -> input_modalities includes "image"
+            has_vision = False
+            
+            # Check architecture.input_modalities
+            if 'architecture' in model and 'input_modalities' in model['architecture']:
+                if 'image' in model['architecture']['input_modalities']:
+                    has_vision = True
+            
+            # Check logic for specific known vision models if metadata is missing
+            if not has_vision:
+                lid = model.get('id', '').lower()
+                if any(x in lid for x in ['vision', 'gemini', 'claude-3', 'gpt-4o', 'gpt-4-turbo', 'llava']):
+                    # This is a heuristic fallback, but relying on metadata is safer.
+                    # For now, let's strictly trust the metadata or the IDs we know act like vision models
+                    if 'gpt-4' in lid or 'gemini' in lid or 'claude-3' in lid:
+                        has_vision = True
+
+            if has_vision:
+                models.append(model['id'])
+                capabilities[model['id']] = openRouterCapabilities(model)
+    
+    models.sort()
+    return models, capabilities
+
+def openRouterCapabilities(model):
+    """Return the capability index entry for one OpenRouter catalog model."""
+    pricing = model.get('pricing') or {}
+    try:
+        free = float(pricing.get('prompt', 1)) == 0 and float(pricing.get('completion', 1)) == 0
+    except (TypeError, ValueError):
+        free = False
+    topProvider = model.get('top_provider') or {}
+    return {
+        "image": True,
+        "free": free or model['id'].endswith(":free"),
+        "context": model.get('context_length') or topProvider.get('context_length'),
+        "maxCompletion": topProvider.get('max_completion_tokens'),
+        "maxImageBytes": None
+    }
+
 def fetchOpenRouterModels():
-    """Fetch available models from OpenRouter that support image input."""
+    """Fetch available models from OpenRouter that support image input.
+
+    The capability index is refreshed from the same catalog response.
+    """
     try:
         log.info("Fetching models from OpenRouter...")
-        response = requests.get(
-            "https://openrouter.ai/api/v1/models",
-            timeout=10
-        )
+        status = data = None
+        if useDaemon():
+            try:
+                reply = daemonClient.call({
+                    "op": "get",
+                    "url": "https://openrouter.ai/api/v1/models",
+                    "timeout": 10,
+                    "cacheSeconds": DAEMON_CATALOG_CACHE_SECONDS
+                })
+                status, data = reply["status"], reply["json"]
+            except DaemonUnavailable as e:
+                log.info(f"Description daemon unavailable, fetching in process: {e}")
+        if status is None:
+            response = requests.get(
+                "https://openrouter.ai/api/v1/models",
+                timeout=10
+            )
+            status = response.status_code
+            if status == 200:
+                data = response.json()
         
-        if response.status_code != 200:
-            log.error(f"Failed to fetch OpenRouter models: {response.status_code}")
+        if status != 200:
+            log.error(f"Failed to fetch OpenRouter models: {status}")
             return []
             
-        data = response.json()
-        models = []
-        
-        if 'data' in data:
-            for model in data['data']:
-                # Check if the model supports image input
-                # Based on OpenRouter docs: architecture -> input_modalities includes "image"
-                has_vision = False
-                
-                # Check architecture.input_modalities
-                if 'architecture' in model and 'input_modalities' in model['architecture']:
-                    if 'image' in model['architecture']['input_modalities']:
-                        has_vision = True
-                
-                # Check logic for specific known vision models if metadata is missing
-                if not has_vision:
-                    lid = model.get('id', '').lower()
-                    if any(x in lid for x in ['vision', 'gemini', 'claude-3', 'gpt-4o', 'gpt-4-turbo', 'llava']):
-                        # This is a heuristic fallback, but relying on metadata is safer.
-                        # For now, let's strictly trust the metadata or the IDs we know act like vision models
-                        if 'gpt-4' in lid or 'gemini' in lid or 'claude-3' in lid:
-                            has_vision = True
-
-                if has_vision:
-                    models.append(model['id'])
-        
-        models.sort()
+        models, capabilities = parseOpenRouterCatalog(data)
+        updateCapabilities("openrouter", capabilities)
+        _catalogsFetched.add("openrouter")
         log.info(f"Fetched {len(models)} vision models from OpenRouter")
         return models
         
@@ -88,31 +983,645 @@ def fetchOpenRouterModels():
         log.error(f"Error fetching OpenRouter models: {e}")
         return []
 
-# Text Window Class
-class TextWindow(wx.Frame):
-    """A simple text window to display image descriptions."""
+# Capability index: what each model accepts, checked before a request is sent.
+# Built from each provider's model listing and cached between sessions.
+CAPABILITY_INDEX_FILES = {
+    "openrouter": "modelCapabilities.json",
+    "openai": "openaiModelCapabilities.json",
+    "claude": "claudeModelCapabilities.json"
+}
+# Listings older than this are fetched again when NVDA starts
+CAPABILITY_INDEX_MAX_AGE = 24 * 60 * 60
+OPENAI_MAX_IMAGE_BYTES = 20 * 1024 * 1024
+CLAUDE_MAX_IMAGE_BYTES = 5 * 1024 * 1024
+# Rough request size estimates for the context check: the most input tokens an
+# image costs at the providers' default resolution, and characters per text token
+IMAGE_TOKEN_ESTIMATE = 1600
+CHARS_PER_TOKEN = 3
+
+# The OpenAI listing only says which models exist. These are the chat model families
+# that read images, with their context windows, and the variants that do not.
+OPENAI_VISION_FAMILIES = {
+    "gpt-4o": 128000,
+    "chatgpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-5": 400000,
+    "o1": 200000,
+    "o3": 200000,
+    "o4-mini": 200000
+}
+OPENAI_EXCLUDED_VARIANTS = ["audio", "realtime", "search", "transcribe", "tts", "codex", "o1-mini", "o1-preview", "-pro", "deep-research"]
+# Preferred OpenAI defaults, in order, when the selected model is not listed
+OPENAI_DEFAULT_MODELS = ["gpt-4o", "gpt-4.1", "gpt-4o-mini"]
+# The Claude listing gives context limits when the API reports them
+CLAUDE_DEFAULT_CONTEXT = 200000
+CLAUDE_DEFAULT_FAMILY = "sonnet"
+
+_capabilityIndexes = {}
+# Services whose model listing has been fetched since NVDA started
+_catalogsFetched = set()
+
+class PreflightError(Exception):
+    """Raised when the capability index shows a request cannot succeed."""
+
+def getCapabilities(service):
+    """Return the capability index of service, loading it from disk on first use.
+
+    An empty index means the service's listing has never been fetched.
+    """
+    if service not in _capabilityIndexes:
+        try:
+            with open(dataPath(CAPABILITY_INDEX_FILES[service]), "r", encoding="utf-8") as f:
+                _capabilityIndexes[service] = json.load(f)
+        except FileNotFoundError:
+            _capabilityIndexes[service] = {}
+        except Exception as e:
+            log.error(f"Error reading {service} model capability index: {e}")
+            _capabilityIndexes[service] = {}
+    return _capabilityIndexes[service]
+
+def updateCapabilities(service, capabilities):
+    """Replace the capability index of service and save it."""
+    _capabilityIndexes[service] = capabilities
+    try:
+        with open(dataPath(CAPABILITY_INDEX_FILES[service]), "w", encoding="utf-8") as f:
+            json.dump(capabilities, f, separators=(",", ":"), sort_keys=True)
+    except Exception as e:
+        log.error(f"Error saving {service} model capability index: {e}")
+
+def capabilityIndexAge(service):
+    """Return the age in seconds of the saved index of service, or None if there is none."""
+    try:
+        return time.time() - os.path.getmtime(dataPath(CAPABILITY_INDEX_FILES[service]))
+    except OSError:
+        return None
+
+def parseOpenAIModels(data):
+    """Return the capability index entries of the vision models in an OpenAI listing."""
+    capabilities = {}
+    for model in data.get('data', []):
+        modelId = model.get('id', "")
+        if any(variant in modelId for variant in OPENAI_EXCLUDED_VARIANTS):
+            continue
+        for family, context in OPENAI_VISION_FAMILIES.items():
+            if modelId == family or modelId.startswith(f"{family}-"):
+                capabilities[modelId] = {
+                    "image": True,
+                    "context": context,
+                    "maxImageBytes": OPENAI_MAX_IMAGE_BYTES,
+                    "created": model.get('created') or 0
+                }
+                break
+    return capabilities
 
-    def __init__(self, text, title, readOnly=True, insertionPoint=0):
-        super(TextWindow, self).__init__(wx.GetApp().TopWindow, title=title)
+def parseClaudeModels(listing):
+    """Return the capability index entries of the models in an Anthropic listing.
+
+    Every Claude model since Claude 3 reads images.
+    """
+    capabilities = {}
+    for model in listing:
+        modelId = model.get('id', "")
+        if not modelId.startswith("claude-") or modelId.startswith(("claude-2", "claude-instant")):
+            continue
+        try:
+            created = int(datetime.datetime.fromisoformat(model['created_at'].replace("Z", "+00:00")).timestamp())
+        except (KeyError, ValueError, AttributeError):
+            created = 0
+        capabilities[modelId] = {
+            "image": True,
+            "context": model.get('max_input_tokens') or CLAUDE_DEFAULT_CONTEXT,
+            "maxCompletion": model.get('max_tokens'),
+            "maxImageBytes": CLAUDE_MAX_IMAGE_BYTES,
+            "created": created
+        }
+    return capabilities
+
+def fetchProviderModels(service):
+    """Fetch the OpenAI or Anthropic model listing and rebuild that service's capability index.
+
+    Returns the listed vision models, newest first, or an empty list when there is
+    no API key or the listing cannot be fetched.
+    """
+    apiKey = serviceApiKey(service)
+    if not apiKey:
+        return []
+    try:
+        log.info(f"Fetching models from {service}...")
+        if service == "openai":
+            response = requests.get(
+                "https://api.openai.com/v1/models",
+                headers={"Authorization": f"Bearer {apiKey}"},
+                timeout=10
+            )
+            if response.status_code != 200:
+                log.error(f"Failed to fetch OpenAI models: {response.status_code}")
+                return []
+            capabilities = parseOpenAIModels(response.json())
+        else:
+            listing = []
+            params = {"limit": 1000}
+            while True:
+                response = requests.get(
+                    "https://api.anthropic.com/v1/models",
+                    headers={"x-api-key": apiKey, "anthropic-version": "2023-06-01"},
+                    params=params,
+                    timeout=10
+                )
+                if response.status_code != 200:
+                    log.error(f"Failed to fetch Claude models: {response.status_code}")
+                    return []
+                page = response.json()
+                listing += page.get('data', [])
+                if not page.get('has_more'):
+                    break
+                params["after_id"] = page['last_id']
+            capabilities = parseClaudeModels(listing)
+        if not capabilities:
+            log.error(f"The {service} listing has no models that read images")
+            return []
+        updateCapabilities(service, capabilities)
+        _catalogsFetched.add(service)
+        models = modelsByAge(capabilities)
+        MODEL_OPTIONS[service] = models
+        log.info(f"Fetched {len(models)} vision models from {service}")
+        return models
+    except Exception as e:
+        log.error(f"Error fetching {service} models: {e}")
+        return []
+
+def modelsByAge(capabilities):
+    """Return the model IDs of an index, newest first."""
+    return sorted(capabilities, key=lambda model: capabilities[model].get("created") or 0, reverse=True)
+
+def listedModel(capabilities, model):
+    """Return the index entry of model, which may be an alias of a dated model, or None."""
+    if not model:
+        return None
+    if model in capabilities:
+        return capabilities[model]
+    # Aliases such as claude-sonnet-4-5 name the newest dated model of their line
+    for candidate in modelsByAge(capabilities):
+        if candidate.startswith(f"{model}-"):
+            return capabilities[candidate]
+    return None
+
+def defaultModel(service):
+    """Return the model used when none is selected or the selected one is no longer listed."""
+    capabilities = getCapabilities(service)
+    if not capabilities:
+        return MODEL_OPTIONS[service][0] if MODEL_OPTIONS[service] else None
+    models = modelsByAge(capabilities)
+    if service == "openai":
+        preferred = [model for model in OPENAI_DEFAULT_MODELS if model in capabilities]
+    else:
+        preferred = [model for model in models if CLAUDE_DEFAULT_FAMILY in model]
+    return (preferred or models)[0]
+
+def isListedModel(service, model):
+    """Return whether model is available, as far as the capability index knows."""
+    capabilities = getCapabilities(service)
+    return not capabilities or listedModel(capabilities, model) is not None
+
+def preflightRequest(service, model, images, text=""):
+    """Validate and route a request against the capability index before sending it.
+
+    Returns (model, notice): the model ID to request and, when it differs from the
+    selected model for a reason the user should know about, a message saying so.
+    For OpenRouter the free-providers-only setting is resolved here, so the
+    returned ID is final. text is all the text the request sends, for the context
+    check. Raises PreflightError when the request cannot succeed.
+    """
+    notice = None
+    if service in ("openai", "claude"):
+        capabilities = getCapabilities(service)
+        entry = listedModel(capabilities, model)
+        if entry is None:
+            usable = defaultModel(service)
+            if not usable:
+                raise PreflightError(f"No available {SERVICE_NAMES[service]} model reads images")
+            # Without a listing yet, a selected model is sent as configured
+            if model and capabilities:
+                notice = f"{model} is no longer available, using {usable}"
+            if not model or capabilities:
+                model = usable
+            entry = listedModel(capabilities, model) or {}
+    elif service == "openrouter":
+        capabilities = getCapabilities("openrouter")
+        if not model:
+            if not MODEL_OPTIONS["openrouter"]:
+                raise PreflightError("Choose an OpenRouter model in the WhatsApp Image Description settings")
+            model = MODEL_OPTIONS["openrouter"][0]
+        # Without a catalog yet, send the request as configured
+        entry = capabilities.get(model, {}) if capabilities else {}
+        if capabilities and not entry:
+            raise PreflightError(f"{model} is no longer offered by OpenRouter or cannot read images")
+        if config.conf['WhatsAppImageDescription']['openrouterForceFree'] and not model.endswith(":free"):
+            if f"{model}:free" in capabilities:
+                model = f"{model}:free"
+                entry = capabilities[model]
+            elif capabilities and not entry.get("free"):
+                raise PreflightError(f"{model} has no free variant. Choose another model or turn off free providers only")
+            elif not capabilities:
+                model = f"{model}:free"
+    else:
+        raise PreflightError("Unknown API service selected")
+
+    if entry.get("image") is False:
+        raise PreflightError(f"{model} cannot read images")
+    maxImageBytes = entry.get("maxImageBytes")
+    if maxImageBytes:
+        for image in images:
+            # Limits apply to the base64 encoded image
+            if 4 * ((len(image) + 2) // 3) > maxImageBytes:
+                raise PreflightError(f"The image is too large for {model}")
+    context = entry.get("context")
+    if context:
+        outputTokens = config.conf['WhatsAppImageDescription']['maxTokens']
+        if entry.get("maxCompletion"):
+            outputTokens = min(outputTokens, entry["maxCompletion"])
+        estimate = len(text) // CHARS_PER_TOKEN + IMAGE_TOKEN_ESTIMATE * len(images) + outputTokens
+        if estimate > context:
+            raise PreflightError(
+                f"The request needs about {estimate} tokens, more than the {context} {model} accepts"
+            )
+    return model, notice
+
+def openRouterHeaders(api_key):
+    """Return the request headers for the OpenRouter API."""
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+        "HTTP-Referer": "https://github.com/jasonpython50/whatsappImageDescriber",
+        "X-Title": "WhatsApp Image Describer NVDA Add-on"
+    }
+
+# Model latency benchmark
+BENCHMARK_CONCURRENCY = 3
+BENCHMARK_TIMEOUT = 60
+BENCHMARK_MAX_IMAGES = 5
+BENCHMARK_CORPUS_DIR = "benchmarkCorpus"
+LEADERBOARD_FILE = "modelLatency.json"
+
+def loadBenchmarkCorpus():
+    """Return the PNG/JPEG images of the local benchmark corpus.
+
+    Images are read from the benchmarkCorpus folder of the add-on's data directory,
+    in file name order. When it holds no images, generated test patterns are used so
+    the benchmark always runs against the same content.
+    """
+    directory = dataPath(BENCHMARK_CORPUS_DIR)
+    os.makedirs(directory, exist_ok=True)
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if os.path.splitext(name)[1].lower() in (".png", ".jpg", ".jpeg"):
+            with open(os.path.join(directory, name), "rb") as f:
+                images.append(f.read())
+        if len(images) >= BENCHMARK_MAX_IMAGES:
+            break
+    if not images:
+        images = [makeTestPng(seed=seed) for seed in range(3)]
+    return images
+
+def timeOpenRouterRequest(model, image, api_key, prompt):
+    """Stream one OpenRouter request and return its latency measurements.
+
+    Returns a dict with the time to first token and total time in seconds,
+    the number of output tokens and an error string or None.
+    """
+    result = {"model": model, "ttft": None, "total": None, "tokens": 0, "error": None}
+    payload = {
+        "model": model,
+        "stream": True,
+        "usage": {"include": True},
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": imagePlaceholder(0, "data:image/png;base64,")}}
+                ]
+            }
+        ],
+        "max_tokens": config.conf['WhatsAppImageDescription']['maxTokens']
+    }
+    start = time.perf_counter()
+    try:
+        response = requests.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers=openRouterHeaders(api_key),
+            data=StreamedJsonBody(payload, [image]),
+            stream=True,
+            timeout=BENCHMARK_TIMEOUT
+        )
+        if response.status_code != 200:
+            result["error"] = f"HTTP {response.status_code}"
+            return result
+        contentChunks = 0
+        for line in response.iter_lines():
+            # Server-sent events; lines starting with ":" are keep-alive comments
+            if not line.startswith(b"data: "):
+                continue
+            data = line[len(b"data: "):]
+            if data == b"[DONE]":
+                break
+            event = json.loads(data)
+            if 'error' in event:
+                result["error"] = event['error'].get('message', "Unknown error")
+                break
+            for choice in event.get('choices', []):
+                if choice.get('delta', {}).get('content'):
+                    if result["ttft"] is None:
+                        result["ttft"] = time.perf_counter() - start
+                    contentChunks += 1
+            if event.get('usage'):
+                result["tokens"] = event['usage'].get('completion_tokens') or 0
+        result["total"] = time.perf_counter() - start
+        if not result["tokens"]:
+            result["tokens"] = contentChunks
+        if result["ttft"] is None and not result["error"]:
+            result["error"] = "No output"
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def summarizeBenchmark(results, leaderboard=None):
+    """Fold benchmark results into a leaderboard dict keyed by model ID.
+
+    Each entry holds the number of runs, the error rate and, when any run
+    succeeded, the median time to first token, total latency and output tokens/sec.
+    """
+    leaderboard = dict(leaderboard or {})
+    runsByModel = {}
+    for result in results:
+        runsByModel.setdefault(result["model"], []).append(result)
+    for model, runs in runsByModel.items():
+        succeeded = [run for run in runs if not run["error"]]
+        entry = {
+            "runs": len(runs),
+            "errorRate": (len(runs) - len(succeeded)) / len(runs),
+            "updated": int(time.time())
+        }
+        if succeeded:
+            entry["ttft"] = statistics.median(run["ttft"] for run in succeeded)
+            entry["total"] = statistics.median(run["total"] for run in succeeded)
+            rates = [
+                run["tokens"] / (run["total"] - run["ttft"])
+                for run in succeeded if run["total"] > run["ttft"]
+            ]
+            entry["tokensPerSecond"] = statistics.median(rates) if rates else 0.0
+        leaderboard[model] = entry
+    return leaderboard
+
+def loadLeaderboard():
+    """Return the stored model latency leaderboard, or an empty dict."""
+    try:
+        with open(dataPath(LEADERBOARD_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        log.error(f"Error reading model latency leaderboard: {e}")
+        return {}
+
+def saveLeaderboard(leaderboard):
+    try:
+        with open(dataPath(LEADERBOARD_FILE), "w", encoding="utf-8") as f:
+            json.dump(leaderboard, f, indent=1, sort_keys=True)
+    except Exception as e:
+        log.error(f"Error saving model latency leaderboard: {e}")
+
+def runModelBenchmark(models, api_key, images=None):
+    """Benchmark models against the local corpus with bounded concurrency.
+
+    Every model is sent every corpus image, at most BENCHMARK_CONCURRENCY requests
+    at a time. Models the capability index rules out are recorded as failed
+    without sending anything. The stored leaderboard is updated and returned.
+    """
+    if images is None:
+        images = loadBenchmarkCorpus()
+    prompt = describePrompt()
+    results = []
+    with ThreadPoolExecutor(max_workers=BENCHMARK_CONCURRENCY) as executor:
+        futures = []
+        for model in models:
+            try:
+                requestModel = preflightRequest("openrouter", model, images, prompt)[0]
+            except PreflightError as e:
+                results.append({"model": model, "ttft": None, "total": None, "tokens": 0, "error": str(e)})
+                continue
+            for image in images:
+                futures.append(executor.submit(timeOpenRouterRequest, requestModel, image, api_key, prompt))
+        for future in futures:
+            result = future.result()
+            # Record free variants under the model ID shown in the settings panel
+            if result["model"] not in models and result["model"].endswith(":free"):
+                result["model"] = result["model"][:-len(":free")]
+            results.append(result)
+    leaderboard = summarizeBenchmark(results, loadLeaderboard())
+    saveLeaderboard(leaderboard)
+    return leaderboard
+
+def modelLabel(model, entry):
+    """Return the model ID annotated with its benchmark results, if any."""
+    if not entry:
+        return model
+    if entry.get("total") is None:
+        return f"{model} (failed benchmark)"
+    label = f"{model} ({entry['total']:.1f} s, first token {entry['ttft']:.1f} s, {entry['tokensPerSecond']:.0f} tok/s"
+    if entry["errorRate"]:
+        label += f", {entry['errorRate']:.0%} errors"
+    return label + ")"
+
+def rankModels(models, leaderboard):
+    """Sort model IDs by benchmark latency and return (ids, labels).
+
+    Benchmarked models come first, fastest total latency first, then models
+    whose benchmark failed, then unbenchmarked models in their original order.
+    """
+    def sortKey(item):
+        index, model = item
+        entry = leaderboard.get(model)
+        if entry and entry.get("total") is not None:
+            return (0, entry["total"], index)
+        if entry:
+            return (1, 0, index)
+        return (2, 0, index)
+
+    ranked = [model for index, model in sorted(enumerate(models), key=sortKey)]
+    return ranked, [modelLabel(model, leaderboard.get(model)) for model in ranked]
+
+# Number of recent descriptions kept as pages in the description window
+DESCRIPTION_HISTORY_SIZE = 10
+
+# Description Window Class
+class DescriptionWindow(wx.Frame):
+    """A long-lived window showing recent image descriptions, one page per result.
+
+    The window is created once and reused. New results are inserted as the first page,
+    the oldest page is dropped beyond DESCRIPTION_HISTORY_SIZE, and closing the window
+    only hides it. Use CTRL+TAB to move between recent descriptions.
+    """
+
+    def __init__(self):
+        super(DescriptionWindow, self).__init__(wx.GetApp().TopWindow, title="Image Description")
         sizer = wx.BoxSizer(wx.VERTICAL)
-        style = wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_RICH
-        self.outputCtrl = wx.TextCtrl(self, style=style)
-        self.outputCtrl.Bind(wx.EVT_KEY_DOWN, self.onOutputKeyDown)
-        sizer.Add(self.outputCtrl, proportion=1, flag=wx.EXPAND)
+        self.notebook = wx.Notebook(self)
+        sizer.Add(self.notebook, proportion=1, flag=wx.EXPAND)
         self.SetSizer(sizer)
-        sizer.Fit(self)
-        self.outputCtrl.SetValue(text)
-        self.outputCtrl.SetFocus()
-        self.outputCtrl.SetInsertionPoint(insertionPoint)
-        self.Raise()
+        self.Bind(wx.EVT_CLOSE, self.onClose)
         self.Maximize()
-        self.Show()
+
+    def addResult(self, text, title):
+        """Show text on a new page, focus it and return the page's text control."""
+        self.Freeze()
+        try:
+            while self.notebook.GetPageCount() >= DESCRIPTION_HISTORY_SIZE:
+                self.notebook.DeletePage(self.notebook.GetPageCount() - 1)
+            style = wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_RICH
+            outputCtrl = wx.TextCtrl(self.notebook, style=style)
+            outputCtrl.Bind(wx.EVT_KEY_DOWN, self.onOutputKeyDown)
+            outputCtrl.SetValue(text)
+            self.notebook.InsertPage(0, outputCtrl, f"{title} {time.strftime('%H:%M:%S')}", select=True)
+        finally:
+            self.Thaw()
+        self.SetTitle(title)
+        if not self.IsShown():
+            self.Show()
+        self.Raise()
+        outputCtrl.SetFocus()
+        outputCtrl.SetInsertionPoint(0)
+        return outputCtrl
 
     def onOutputKeyDown(self, event):
         if event.GetKeyCode() == wx.WXK_ESCAPE:
-            self.Close()
+            self.Hide()
         event.Skip()
 
+    def onClose(self, event):
+        if event.CanVeto():
+            event.Veto()
+            self.Hide()
+        else:
+            self.Destroy()
+
+_descriptionWindow = None
+
+def getDescriptionWindow():
+    """Return the shared description window, creating it on first use. Main thread only."""
+    global _descriptionWindow
+    if _descriptionWindow is None:
+        _descriptionWindow = DescriptionWindow()
+    return _descriptionWindow
+
+@measureMainThread
+def showDescription(text, title="Image Description", resultTime=None):
+    """Show a result in the shared description window and return its text control.
+
+    resultTime is the time.perf_counter() value taken when the result arrived;
+    when given, the delay until the description has focus is logged.
+    """
+    outputCtrl = getDescriptionWindow().addResult(text, title)
+    if resultTime is not None:
+        log.info(f"Description focused {(time.perf_counter() - resultTime) * 1000:.1f} ms after result")
+    return outputCtrl
+
+def destroyDescriptionWindow():
+    """Destroy the shared description window if it exists."""
+    global _descriptionWindow
+    if _descriptionWindow is not None:
+        _descriptionWindow.Destroy()
+        _descriptionWindow = None
+
+# Model picker
+class ModelIndex(object):
+    """A searchable index of model IDs, display labels and capability metadata.
+
+    Each entry keeps a lower-case search key built from the ID, the label and the
+    metadata, so filtering is a substring test per entry. update() applies a new
+    catalog incrementally, rebuilding only entries that were added or changed. A
+    search that extends the previous one only scans the previous results.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.order = []
+        self._lastQuery = None
+        self._lastResults = []
+
+    def __contains__(self, model):
+        return model in self._entries
+
+    def __len__(self):
+        return len(self.order)
+
+    @staticmethod
+    def searchKey(model, label, metadata):
+        terms = [model, label]
+        if metadata.get("free"):
+            terms.append("free")
+        if metadata.get("context"):
+            terms.append(f"{metadata['context'] // 1000}k context")
+        return " ".join(terms).lower()
+
+    def update(self, models, labels, metadata=None):
+        """Replace the indexed catalog and return the number of entries added, changed or removed."""
+        metadata = metadata or {}
+        entries = {}
+        changed = 0
+        for model, label in zip(models, labels):
+            modelMetadata = metadata.get(model) or {}
+            entry = self._entries.get(model)
+            if entry is None or entry[0] != label or entry[2] != modelMetadata:
+                entry = (label, self.searchKey(model, label, modelMetadata), modelMetadata)
+                changed += 1
+            entries[model] = entry
+        changed += len(self._entries.keys() - entries.keys())
+        if changed or self.order != list(models):
+            self._lastQuery = None
+        self._entries = entries
+        self.order = list(models)
+        return changed
+
+    def label(self, model):
+        return self._entries[model][0]
+
+    def search(self, text):
+        """Return the model IDs, in catalog order, whose entry contains every word of text."""
+        query = text.lower().strip()
+        terms = query.split()
+        candidates = self.order
+        if self._lastQuery is not None and query.startswith(self._lastQuery):
+            candidates = self._lastResults
+        results = [model for model in candidates if all(term in self._entries[model][1] for term in terms)]
+        self._lastQuery = query
+        self._lastResults = results
+        return results
+
+class ModelListCtrl(wx.ListCtrl):
+    """A virtual list of model labels; rows are only rendered when shown."""
+
+    def __init__(self, parent, **kwargs):
+        super(ModelListCtrl, self).__init__(
+            parent,
+            style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_SINGLE_SEL | wx.LC_NO_HEADER,
+            size=(500, 200),
+            **kwargs
+        )
+        self.InsertColumn(0, "Model", width=480)
+        self.labels = []
+
+    def setItems(self, labels):
+        self.labels = labels
+        # Clear the selection of every row before the rows change
+        self.SetItemState(-1, 0, wx.LIST_STATE_SELECTED)
+        self.SetItemCount(len(labels))
+        self.Refresh()
+
+    def OnGetItemText(self, item, column):
+        return self.labels[item]
+
 # Settings Panel
 class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
     title = "WhatsApp Image Description"
@@ -121,11 +1630,7 @@ class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
         helper = guiHelper.BoxSizerHelper(self, sizer=sizer)
         
         # API Service
-        apiServiceChoices = [
-            "OpenAI (GPT-4 Vision)",
-            "OpenRouter",
-            "Anthropic Claude"
-        ]
+        apiServiceChoices = list(SERVICE_NAMES.values())
         self.apiServiceChoice = helper.addLabeledControl(
             "AI Service:",
             wx.Choice,
@@ -138,8 +1643,6 @@ class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
             self.apiServiceChoice.SetSelection(0)
         elif apiService == "openrouter":
             self.apiServiceChoice.SetSelection(1)
-            # Trigger model fetch if OpenRouter is already selected
-            wx.CallAfter(self.updateModelChoices)
         elif apiService == "claude":
             self.apiServiceChoice.SetSelection(2)
         else:
@@ -176,24 +1679,51 @@ class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
             style=wx.TE_PASSWORD
         )
         
+        self.benchmarkModelsEdit = helper.addLabeledControl(
+            "Models to benchmark (comma separated, blank for the selected model):",
+            wx.TextCtrl,
+            value=config.conf["WhatsAppImageDescription"]["benchmarkModels"]
+        )
+        
         # Initially show only the relevant API key field
         self.updateApiKeyVisibility()
         
         # Model Selection
+        self.modelIndex = ModelIndex()
+        # Model IDs of the rows currently listed, and the row of each
         self.modelChoices = []
-        # Don't call updateModelChoices here immediately for OpenRouter to avoid blocking init
-        # It's handled by CallAfter above or onApiServiceChange
-        if apiService != "openrouter":
-            self.updateModelChoices()
+        self.modelRows = {}
+        self.selectedModel = config.conf["WhatsAppImageDescription"]["selectedModel"]
+        self._catalogRefreshStarted = set()
         
-        self.modelChoice = helper.addLabeledControl(
-            "Model:",
-            wx.Choice,
-            choices=self.modelChoices
+        self.modelFilterEdit = helper.addLabeledControl("Filter models:", wx.TextCtrl)
+        self.modelFilterEdit.Bind(wx.EVT_TEXT, self.onModelFilterChange)
+        
+        self.modelList = helper.addLabeledControl("Model:", ModelListCtrl)
+        self.modelList.Bind(wx.EVT_LIST_ITEM_SELECTED, self.onModelSelected)
+        
+        # The OpenRouter catalog is refreshed in the background; the saved one is listed meanwhile
+        self.updateModelChoices()
+        
+        self.autoCropCheck = helper.addItem(
+            wx.CheckBox(self, label="Crop captures to the image inside the message")
         )
+        self.autoCropCheck.SetValue(config.conf["WhatsAppImageDescription"]["autoCrop"])
         
-        # Set current model selection
-        self.updateModelSelection()
+        self.useDaemonCheck = helper.addItem(
+            wx.CheckBox(self, label="Send requests through the description daemon when it is running")
+        )
+        self.useDaemonCheck.SetValue(config.conf["WhatsAppImageDescription"]["useDaemon"])
+        
+        self.recordCorpusCheck = helper.addItem(
+            wx.CheckBox(self, label="Record captures for performance testing (pixelated, names removed)")
+        )
+        self.recordCorpusCheck.SetValue(config.conf["WhatsAppImageDescription"]["recordCorpus"])
+        
+        self.collectPackDescriptionsCheck = helper.addItem(
+            wx.CheckBox(self, label="Remember descriptions of images for exporting description packs")
+        )
+        self.collectPackDescriptionsCheck.SetValue(config.conf["WhatsAppImageDescription"]["collectPackDescriptions"])
         
         # Max tokens
         self.maxTokensEdit = helper.addLabeledControl(
@@ -204,25 +1734,31 @@ class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
             initial=config.conf["WhatsAppImageDescription"]["maxTokens"]
         )
         
+        self.stallThresholdEdit = helper.addLabeledControl(
+            "Log main thread stalls longer than (milliseconds):",
+            wx.SpinCtrl,
+            min=50,
+            max=5000,
+            initial=config.conf["WhatsAppImageDescription"]["stallThresholdMs"]
+        )
+        
         # Language
-        languageChoices = [
-            "English",
-            "Spanish",
-            "French",
-            "German",
-            "Italian",
-            "Portuguese",
-            "Russian",
-            "Japanese",
-            "Chinese",
-            "Arabic"
-        ]
+        languageChoices = LANGUAGES
         self.languageChoice = helper.addLabeledControl(
             "Description language:",
             wx.Choice,
             choices=languageChoices
         )
         
+        packButtons = guiHelper.ButtonHelper(wx.HORIZONTAL)
+        importPackButton = packButtons.addButton(self, label="Import description pack...")
+        importPackButton.Bind(wx.EVT_BUTTON, self.onImportPack)
+        exportPackButton = packButtons.addButton(self, label="Export description pack...")
+        exportPackButton.Bind(wx.EVT_BUTTON, self.onExportPack)
+        forgetDescriptionsButton = packButtons.addButton(self, label="Forget remembered descriptions")
+        forgetDescriptionsButton.Bind(wx.EVT_BUTTON, self.onForgetDescriptions)
+        helper.addItem(packButtons)
+        
         # Set the current selection for language
         currentLang = config.conf["WhatsAppImageDescription"]["language"]
         try:
@@ -239,6 +1775,7 @@ class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
         self.openaiApiKeyEdit.Show(False)
         self.openrouterApiKeyEdit.Show(False)
         self.openrouterForceFreeCheck.Show(False)
+        self.benchmarkModelsEdit.Show(False)
         self.claudeApiKeyEdit.Show(False)
         
         # Show only the relevant API key field
@@ -247,58 +1784,125 @@ class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
         elif apiServiceIndex == 1:  # OpenRouter
             self.openrouterApiKeyEdit.Show(True)
             self.openrouterForceFreeCheck.Show(True)
+            self.benchmarkModelsEdit.Show(True)
         elif apiServiceIndex == 2:  # Claude
             self.claudeApiKeyEdit.Show(True)
         
         # Refresh the layout
         self.Layout()
     
+    @measureMainThread
     def updateModelChoices(self):
-        """Update the model choices based on the selected API service."""
-        self.modelChoices.clear()
+        """Index the models of the selected API service and list the ones matching the filter."""
+        service = list(SERVICE_NAMES)[max(0, self.apiServiceChoice.GetSelection())]
+        if service not in _catalogsFetched and service not in self._catalogRefreshStarted:
+            self.refreshModelCatalog(service)
+        if service == "openrouter":
+            # Fastest benchmarked models first, annotated with their latency
+            models, labels = rankModels(MODEL_OPTIONS["openrouter"], loadLeaderboard())
+        else:
+            models = labels = MODEL_OPTIONS[service]
+        metadata = getCapabilities(service)
+        changed = self.modelIndex.update(models, labels, metadata)
+        log.debug(f"Model index updated: {changed} of {len(self.modelIndex)} entries changed")
+        self.applyModelFilter()
+    
+    def refreshModelCatalog(self, service):
+        """Fetch the model listing of service on a background thread and update the list when it arrives."""
+        self._catalogRefreshStarted.add(service)
         
-        apiServiceIndex = self.apiServiceChoice.GetSelection()
-        if apiServiceIndex == 0:  # OpenAI
-            self.modelChoices.extend(MODEL_OPTIONS["openai"])
-        elif apiServiceIndex == 1:  # OpenRouter
-            # Fetch models if not already cached/populated
-            if not MODEL_OPTIONS["openrouter"]:
-                # Fetch synchronously for simplicity in this context, 
-                # though ideally this should be async with a loading indicator.
-                # Given NVDA constraints, we'll do a quick fetch with timeout.
-                fetched_models = fetchOpenRouterModels()
-                if fetched_models:
-                    MODEL_OPTIONS["openrouter"] = fetched_models
-                else:
-                    # Fallback if fetch fails
-                    MODEL_OPTIONS["openrouter"] = ["google/gemini-2.0-flash-exp", "google/gemini-1.5-flash"]
-            
-            self.modelChoices.extend(MODEL_OPTIONS["openrouter"])
-        elif apiServiceIndex == 2:  # Claude
-            self.modelChoices.extend(MODEL_OPTIONS["claude"])
+        def fetch():
+            models = fetchOpenRouterModels() if service == "openrouter" else fetchProviderModels(service)
+            wx.CallAfter(self.onCatalogRefreshed, service, models)
         
-        # Update the choice control if it exists
-        if hasattr(self, 'modelChoice'):
-            self.modelChoice.Clear()
-            self.modelChoice.AppendItems(self.modelChoices)
-            self.updateModelSelection()
+        threading.Thread(target=fetch, daemon=True).start()
+    
+    def onCatalogRefreshed(self, service, models):
+        if models:
+            MODEL_OPTIONS[service] = models
+        elif service == "openrouter" and not MODEL_OPTIONS["openrouter"]:
+            # Fallback if fetch fails
+            MODEL_OPTIONS["openrouter"] = ["google/gemini-2.0-flash-exp", "google/gemini-1.5-flash"]
+        # The panel may have been closed while fetching
+        if self and list(SERVICE_NAMES)[max(0, self.apiServiceChoice.GetSelection())] == service:
+            self.updateModelChoices()
+    
+    def applyModelFilter(self):
+        """List the indexed models matching the filter text."""
+        self.modelChoices = self.modelIndex.search(self.modelFilterEdit.GetValue())
+        self.modelRows = {model: row for row, model in enumerate(self.modelChoices)}
+        self.modelList.setItems([self.modelIndex.label(model) for model in self.modelChoices])
+        self.updateModelSelection()
     
     def updateModelSelection(self):
-        """Update the selected model in the choice control."""
-        selectedModel = config.conf["WhatsAppImageDescription"]["selectedModel"]
-        
-        # If no model is selected or the selected model is not in the list
-        if not selectedModel or selectedModel not in self.modelChoices:
-            # Select the first model if available
-            if self.modelChoices:
-                self.modelChoice.SetSelection(0)
+        """Select the chosen model in the list if it is listed."""
+        # A model from another service, or one no longer offered, is replaced by the first listed
+        if self.selectedModel not in self.modelIndex and self.modelChoices:
+            self.selectedModel = self.modelChoices[0]
+        row = self.modelRows.get(self.selectedModel)
+        if row is None:
+            return
+        self.modelList.SetItemState(
+            row,
+            wx.LIST_STATE_SELECTED | wx.LIST_STATE_FOCUSED,
+            wx.LIST_STATE_SELECTED | wx.LIST_STATE_FOCUSED
+        )
+        self.modelList.EnsureVisible(row)
+    
+    def onModelFilterChange(self, evt):
+        self.applyModelFilter()
+    
+    def onModelSelected(self, evt):
+        row = evt.GetIndex()
+        if 0 <= row < len(self.modelChoices):
+            self.selectedModel = self.modelChoices[row]
+    
+    def onImportPack(self, evt):
+        """Import a description pack chosen by the user."""
+        with wx.FileDialog(
+            self,
+            "Import description pack",
+            wildcard=f"Description packs (*{PACK_EXTENSION})|*{PACK_EXTENSION}",
+            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST
+        ) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
                 return
-        
-        # Otherwise, select the model that matches the configured one
-        for i, model in enumerate(self.modelChoices):
-            if model == selectedModel:
-                self.modelChoice.SetSelection(i)
-                break
+            path = dialog.GetPath()
+        try:
+            count = descriptionPacks.importPack(path)
+            gui.messageBox(f"Imported {count} descriptions.", "Description Pack", wx.OK | wx.ICON_INFORMATION)
+        except Exception as e:
+            log.error(f"Error importing description pack: {e}")
+            gui.messageBox(f"Could not import the description pack: {e}", "Description Pack", wx.OK | wx.ICON_ERROR)
+    
+    def onExportPack(self, evt):
+        """Export recurring descriptions in the selected language as a pack."""
+        language = LANGUAGES[max(0, self.languageChoice.GetSelection())]
+        with wx.FileDialog(
+            self,
+            f"Export {language} descriptions of images you have seen more than once",
+            defaultFile=f"whatsapp-descriptions-{language.lower()}{PACK_EXTENSION}",
+            wildcard=f"Description packs (*{PACK_EXTENSION})|*{PACK_EXTENSION}",
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT
+        ) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            path = dialog.GetPath()
+        try:
+            count = descriptionPacks.exportPack(path, language)
+            gui.messageBox(f"Exported {count} descriptions.", "Description Pack", wx.OK | wx.ICON_INFORMATION)
+        except Exception as e:
+            log.error(f"Error exporting description pack: {e}")
+            gui.messageBox(f"Could not export the description pack: {e}", "Description Pack", wx.OK | wx.ICON_ERROR)
+    
+    def onForgetDescriptions(self, evt):
+        """Delete the descriptions remembered for exporting packs."""
+        try:
+            count = descriptionPacks.forget()
+            gui.messageBox(f"Forgot {count} remembered descriptions.", "Description Pack", wx.OK | wx.ICON_INFORMATION)
+        except Exception as e:
+            log.error(f"Error deleting remembered descriptions: {e}")
+            gui.messageBox(f"Could not delete the remembered descriptions: {e}", "Description Pack", wx.OK | wx.ICON_ERROR)
     
     def onApiServiceChange(self, evt):
         """Handle API service change by updating model choices and API key field."""
@@ -312,6 +1916,7 @@ class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
         config.conf["WhatsAppImageDescription"]["openrouterApiKey"] = self.openrouterApiKeyEdit.GetValue()
         config.conf["WhatsAppImageDescription"]["openrouterForceFree"] = self.openrouterForceFreeCheck.GetValue()
         config.conf["WhatsAppImageDescription"]["claudeApiKey"] = self.claudeApiKeyEdit.GetValue()
+        config.conf["WhatsAppImageDescription"]["benchmarkModels"] = self.benchmarkModelsEdit.GetValue()
         
         # Save API service selection
         serviceIndex = self.apiServiceChoice.GetSelection()
@@ -323,22 +1928,30 @@ class WhatsAppImageDescriptionSettingsPanel(settingsDialogs.SettingsPanel):
             config.conf["WhatsAppImageDescription"]["apiService"] = "claude"
         
         # Save selected model
-        modelIndex = self.modelChoice.GetSelection()
-        if 0 <= modelIndex < len(self.modelChoices):
-            config.conf["WhatsAppImageDescription"]["selectedModel"] = self.modelChoices[modelIndex]
+        if self.selectedModel in self.modelIndex:
+            config.conf["WhatsAppImageDescription"]["selectedModel"] = self.selectedModel
+        
+        config.conf["WhatsAppImageDescription"]["autoCrop"] = self.autoCropCheck.GetValue()
+        config.conf["WhatsAppImageDescription"]["useDaemon"] = self.useDaemonCheck.GetValue()
+        config.conf["WhatsAppImageDescription"]["recordCorpus"] = self.recordCorpusCheck.GetValue()
+        config.conf["WhatsAppImageDescription"]["collectPackDescriptions"] = (
+            self.collectPackDescriptionsCheck.GetValue()
+        )
+        if self.useDaemonCheck.GetValue():
+            # Create the key the daemon authenticates the add-on with
+            daemonClient.authkey()
         
         # Save max tokens
         config.conf["WhatsAppImageDescription"]["maxTokens"] = self.maxTokensEdit.GetValue()
+        config.conf["WhatsAppImageDescription"]["stallThresholdMs"] = self.stallThresholdEdit.GetValue()
         
         # Save language
         langIndex = self.languageChoice.GetSelection()
-        languages = ["English", "Spanish", "French", "German", "Italian", 
-                    "Portuguese", "Russian", "Japanese", "Chinese", "Arabic"]
-        if 0 <= langIndex < len(languages):
-            config.conf["WhatsAppImageDescription"]["language"] = languages[langIndex]
+        if 0 <= langIndex < len(LANGUAGES):
+            config.conf["WhatsAppImageDescription"]["language"] = LANGUAGES[langIndex]
 
-def capture_wx_screenshot(left, top, width, height):
-    """Capture a screenshot using wxPython's screen capture functionality."""
+def grab_wx_image(left, top, width, height):
+    """Copy a screen rectangle into a wx.Image using wxPython's screen DC."""
     try:
         # Create a wx screen DC
         screen_dc = wx.ScreenDC()
@@ -354,21 +1967,375 @@ def capture_wx_screenshot(left, top, width, height):
         mem_dc.Blit(0, 0, width, height, screen_dc, left, top)
         mem_dc.SelectObject(wx.NullBitmap)
         
-        # Convert to PNG data
-        image = screenshot.ConvertToImage()
-        
-        # Create a memory stream to save the PNG
-        stream = io.BytesIO()
-        image.SaveFile(stream, wx.BITMAP_TYPE_PNG)
-        stream.seek(0)
-        
-        # Return the PNG data
-        return stream.read()
+        return screenshot.ConvertToImage()
         
     except Exception as e:
         log.error(f"Error capturing screenshot with wx: {e}")
         return None
 
+def encode_png(image):
+    """Encode a wx.Image as PNG data."""
+    stream = io.BytesIO()
+    image.SaveFile(stream, wx.BITMAP_TYPE_PNG)
+    return stream.getvalue()
+
+# Region-of-interest cropping of message captures
+AUTOCROP_ANALYSIS_WIDTH = 160
+# A coarse colour making up at least this share of every side of an edge is a background colour
+AUTOCROP_EDGE_SHARE = 0.25
+# Background layers peeled from the outside, such as the chat background and the bubble fill
+AUTOCROP_MAX_LAYERS = 3
+# Rows and columns with no more than this share of non-background pixels are trimmed
+AUTOCROP_EMPTY_LINE = 0.04
+# Regions covering less of the capture than this are not trusted
+AUTOCROP_MIN_AREA = 0.15
+AUTOCROP_MIN_SIZE = 64
+
+def outer_edge(background, width, height):
+    """Return the outermost non-background pixels seen from each side, as four lists."""
+    left, right, top, bottom = [], [], [], []
+    for y in range(height):
+        row = [y * width + x for x in range(width) if not background[y * width + x]]
+        if row:
+            left.append(row[0])
+            right.append(row[-1])
+    for x in range(width):
+        column = [y * width + x for y in range(height) if not background[y * width + x]]
+        if column:
+            top.append(column[0])
+            bottom.append(column[-1])
+    return [left, right, top, bottom]
+
+def surrounding_colours(keys, sides):
+    """Return the coarse colours making up a good share of every one of sides."""
+    colours = None
+    for side in sides:
+        if not side:
+            return set()
+        counts = collections.Counter(keys[i] for i in side)
+        common = {key for key, n in counts.items() if n >= len(side) * AUTOCROP_EDGE_SHARE}
+        colours = common if colours is None else colours & common
+    return colours
+
+def border_background(keys, width, height):
+    """Return a bytearray marking the pixels that belong to the capture's background.
+
+    keys holds a coarse colour per pixel. Background is peeled from the outside in,
+    one layer at a time: a colour that surrounds what is left on all four sides, such
+    as the chat background and then the bubble fill, is background where it connects
+    to the outside. A flat area inside the image, such as sky or the white behind a
+    caption, does not surround the rest and stays part of it.
+    """
+    background = bytearray(width * height)
+    for layer in range(AUTOCROP_MAX_LAYERS):
+        edge = outer_edge(background, width, height)
+        colours = surrounding_colours(keys, edge)
+        if not colours:
+            break
+        pending = [i for side in edge for i in side if keys[i] in colours and not background[i]]
+        for i in pending:
+            background[i] = 1
+        while pending:
+            i = pending.pop()
+            x = i % width
+            for neighbour in (
+                i - width if i >= width else -1,
+                i + width if i + width < width * height else -1,
+                i - 1 if x > 0 else -1,
+                i + 1 if x < width - 1 else -1
+            ):
+                if neighbour >= 0 and not background[neighbour] and keys[neighbour] in colours:
+                    background[neighbour] = 1
+                    pending.append(neighbour)
+    return background
+
+def trimmed_span(densities, threshold=AUTOCROP_EMPTY_LINE):
+    """Return (start, end) after trimming lines at or below threshold from both ends.
+
+    Returns None when every line is trimmed.
+    """
+    dense = [i for i, density in enumerate(densities) if density > threshold]
+    if not dense:
+        return None
+    return (dense[0], dense[-1] + 1)
+
+def detect_image_region(rgb, width, height):
+    """Find the image in the RGB data of a message capture.
+
+    Background connected to the border of the capture is trimmed from the outside in,
+    a whole row or column at a time, and the rows and columns left form the region.
+    Nothing inside the outermost content is ever dropped, so a caption or a text line
+    next to the picture stays in the region. Returns (x, y, width, height) or None when
+    no convincing region is found.
+    """
+    count = width * height
+    if not count:
+        return None
+    keys = [
+        ((rgb[i] >> 4) << 8) | ((rgb[i + 1] >> 4) << 4) | (rgb[i + 2] >> 4)
+        for i in range(0, count * 3, 3)
+    ]
+    background = border_background(keys, width, height)
+    rows = [1 - sum(background[y * width:(y + 1) * width]) / width for y in range(height)]
+    rowSpan = trimmed_span(rows)
+    if not rowSpan:
+        return None
+    top, bottom = rowSpan
+    columns = [
+        1 - sum(background[y * width + x] for y in range(top, bottom)) / (bottom - top)
+        for x in range(width)
+    ]
+    columnSpan = trimmed_span(columns)
+    if not columnSpan:
+        return None
+    left, right = columnSpan
+    if (right - left) * (bottom - top) < count * AUTOCROP_MIN_AREA:
+        return None
+    return (left, top, right - left, bottom - top)
+
+def best_hint_region(hints, width, height):
+    """Pick the largest UIA child rectangle that plausibly is the image itself.
+
+    hints are (x, y, width, height) rectangles relative to the capture. Rectangles are
+    clipped to the capture; ones that are tiny or cover nearly all of it are ignored.
+    """
+    best = None
+    for x, y, w, h in hints:
+        left, top = max(0, x), max(0, y)
+        right, bottom = min(width, x + w), min(height, y + h)
+        w, h = right - left, bottom - top
+        if w < AUTOCROP_MIN_SIZE or h < AUTOCROP_MIN_SIZE or w * h >= 0.95 * width * height:
+            continue
+        if best is None or w * h > best[2] * best[3]:
+            best = (left, top, w, h)
+    return best
+
+def find_image_region(image, hints=()):
+    """Locate the image inside a captured wx.Image and return (x, y, width, height).
+
+    UIA child bounds are used when one of them looks like the image; otherwise the
+    region is found from the pixels of a downscaled copy. Returns None when neither
+    gives a region smaller than the capture.
+    """
+    width, height = image.GetWidth(), image.GetHeight()
+    region = best_hint_region(hints, width, height)
+    source = "UIA bounds"
+    if region is None:
+        source = "pixels"
+        scale = min(1.0, AUTOCROP_ANALYSIS_WIDTH / width)
+        scaledWidth = max(1, int(width * scale))
+        scaledHeight = max(1, int(height * scale))
+        # Nearest-neighbour scaling keeps flat colours flat
+        small = image.Scale(scaledWidth, scaledHeight, wx.IMAGE_QUALITY_NORMAL)
+        found = detect_image_region(bytes(small.GetData()), scaledWidth, scaledHeight)
+        if found:
+            x, y, w, h = found
+            left, top = int(x / scale), int(y / scale)
+            region = (
+                left,
+                top,
+                min(width - left, math.ceil(w / scale)),
+                min(height - top, math.ceil(h / scale))
+            )
+    if region is None or region == (0, 0, width, height):
+        return None
+    log.info(f"Image region in {width}x{height} capture: {region}, found from {source}")
+    return region
+
+def crop_to_image_region(image, hints=()):
+    """Crop a captured wx.Image to the image inside it, or return it unchanged."""
+    region = find_image_region(image, hints)
+    if region is None:
+        return image
+    return image.GetSubImage(wx.Rect(*region))
+
+# Record-and-replay corpus for performance regression testing; replayed by
+# tools/replayCorpus.py. Recordings are scrubbed of personal content when saved.
+RECORDINGS_DIR = "recordings"
+RECORDING_VERSION = 1
+RECORDED_TREE_DEPTH = 4
+RECORDED_TREE_NODES = 80
+# Words in element names that the image lookup relies on; all other text is dropped
+RECORDED_NAME_TERMS = ["image", "photo", "picture", "sent", "Photo", "\uf40e"]
+# Pixelation keeps at most this many blocks along the longer side, and blocks of at least
+# SCRUB_MIN_BLOCK_SIZE pixels, so large captures are blurred as much as small ones
+SCRUB_MAX_BLOCKS = 16
+SCRUB_MIN_BLOCK_SIZE = 12
+
+def scrub_name(name):
+    """Reduce an element name to the lookup terms it contains, dropping everything else."""
+    if not name:
+        return ""
+    lowered = name.lower()
+    return " ".join(term for term in RECORDED_NAME_TERMS if term in name or term in lowered)
+
+def scrub_pixels(image):
+    """Pixelate a wx.Image into coarse blocks, keeping its size and flat colours."""
+    width, height = image.GetWidth(), image.GetHeight()
+    blockSize = max(SCRUB_MIN_BLOCK_SIZE, math.ceil(max(width, height) / SCRUB_MAX_BLOCKS))
+    blocks = image.Scale(
+        max(1, width // blockSize),
+        max(1, height // blockSize),
+        wx.IMAGE_QUALITY_BOX_AVERAGE
+    )
+    return blocks.Scale(width, height, wx.IMAGE_QUALITY_NORMAL)
+
+class CaptureRecording(object):
+    """What one ALT+I saw and how long each stage took, for replay on other machines.
+
+    Holds the scrubbed UIA subtree the image lookup walked and the path to the element
+    it chose, the capture rectangle and UIA image bounds, the uncropped capture, a
+    snapshot of the settings without API keys, stage timings in seconds and the
+    provider round trip. Descriptions are not recorded, only their length.
+    """
+
+    def __init__(self):
+        self.data = {
+            "version": RECORDING_VERSION,
+            "time": time.time(),
+            "config": {
+                key: config.conf['WhatsAppImageDescription'][key]
+                for key in SPEC if "ApiKey" not in key
+            },
+            "timings": {},
+            "provider": None
+        }
+        self.image = None
+
+    def time(self, stage, seconds):
+        self.data["timings"][stage] = seconds
+
+    def recordTree(self, messageObj, imageElement):
+        """Serialize the message's UIA subtree, noting the path to imageElement."""
+        budget = [RECORDED_TREE_NODES]
+        self.data["foundPath"] = [] if imageElement == messageObj else None
+
+        def serialize(obj, path, depth):
+            budget[0] -= 1
+            location = obj.location
+            role = getattr(obj, 'role', None)
+            node = {
+                "name": scrub_name(getattr(obj, 'name', "")),
+                "automationId": getattr(obj, 'UIAAutomationId', None),
+                "role": getattr(role, 'name', None if role is None else str(role)),
+                "location": [location.left, location.top, location.width, location.height] if location else None,
+                "children": []
+            }
+            if depth < RECORDED_TREE_DEPTH:
+                for index, child in enumerate(obj.children):
+                    if budget[0] <= 0:
+                        break
+                    childPath = path + [index]
+                    if self.data["foundPath"] is None and child == imageElement:
+                        self.data["foundPath"] = childPath
+                    node["children"].append(serialize(child, childPath, depth + 1))
+            return node
+
+        try:
+            self.data["tree"] = serialize(messageObj, [], 0)
+        except Exception as e:
+            log.error(f"Error recording UIA tree: {e}")
+
+    def recordCapture(self, rect, hints):
+        self.data["rect"] = list(rect)
+        self.data["hints"] = [list(hint) for hint in hints]
+
+    def recordProvider(self, service, model, description, ok=True):
+        self.data["provider"] = {
+            "service": service,
+            "model": model,
+            "requestBytes": getattr(requestStats, 'bytes', None),
+            "seconds": getattr(requestStats, 'seconds', None),
+            "ok": ok and bool(description),
+            "responseChars": len(description or "")
+        }
+
+    def save(self):
+        """Write the recording, with pixelated pixels, to its own folder."""
+        try:
+            # A unique suffix keeps recordings made within the same second apart
+            folder = tempfile.mkdtemp(
+                prefix=time.strftime("%Y%m%d-%H%M%S-", time.localtime(self.data["time"])),
+                dir=dataPath(RECORDINGS_DIR, "")
+            )
+            if self.image is not None:
+                self.data["capture"] = {"file": "capture.png", "width": self.image.GetWidth(), "height": self.image.GetHeight()}
+                scrub_pixels(self.image).SaveFile(os.path.join(folder, "capture.png"), wx.BITMAP_TYPE_PNG)
+            with open(os.path.join(folder, "recording.json"), "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=1)
+            log.info(f"Saved capture recording to {folder}")
+        except Exception as e:
+            log.error(f"Error saving capture recording: {e}")
+
+# Motion capture: sample the image rectangle over a short window and keep
+# only frames that differ visibly from the last kept one.
+MOTION_SAMPLE_COUNT = 10
+MOTION_SAMPLE_INTERVAL_MS = 200
+MOTION_MAX_KEYFRAMES = 4
+# Mean absolute greyscale difference (0-255) for a frame to count as new
+MOTION_DIFF_THRESHOLD = 8
+MOTION_SIGNATURE_SIZE = 32
+
+def frame_signature(image):
+    """Return a small greyscale thumbnail of a wx.Image used to compare frames."""
+    thumb = image.Scale(MOTION_SIGNATURE_SIZE, MOTION_SIGNATURE_SIZE, wx.IMAGE_QUALITY_BOX_AVERAGE)
+    # Greyscale images keep three equal channels, so one is enough
+    return bytes(thumb.ConvertToGreyscale().GetData())[::3]
+
+def frame_difference(first, second):
+    """Return the mean absolute difference between two frame signatures."""
+    if not first or len(first) != len(second):
+        return 255
+    return sum(abs(a - b) for a, b in zip(first, second)) / len(first)
+
+def thin_keyframes(frames, maxFrames):
+    """Evenly drop frames so at most maxFrames remain, always keeping the first and last."""
+    if len(frames) <= maxFrames:
+        return frames
+    if maxFrames == 1:
+        return frames[:1]
+    step = (len(frames) - 1) / (maxFrames - 1)
+    return [frames[round(i * step)] for i in range(maxFrames)]
+
+class MotionSampler(object):
+    """Samples a screen rectangle over time and keeps distinct keyframes.
+
+    Each sample is taken on the main thread from a wx.CallLater chain, so NVDA stays
+    responsive between samples. Only frames that differ from the last kept frame by
+    more than MOTION_DIFF_THRESHOLD are retained, which bounds memory while sampling.
+    When sampling ends, onDone is called with at most MOTION_MAX_KEYFRAMES wx.Images
+    in capture order; cropping and encoding them is left to the caller's worker thread.
+    """
+
+    def __init__(self, rect, onDone, sampleCount=MOTION_SAMPLE_COUNT, intervalMs=MOTION_SAMPLE_INTERVAL_MS):
+        self.rect = rect
+        self.onDone = onDone
+        self.sampleCount = sampleCount
+        self.intervalMs = intervalMs
+        self._taken = 0
+        self._keyframes = []
+        self._lastSignature = None
+
+    def start(self):
+        self._sample()
+
+    @measureMainThread
+    def _sample(self):
+        self._taken += 1
+        image = grab_wx_image(*self.rect)
+        if image is not None:
+            signature = frame_signature(image)
+            if self._lastSignature is None or frame_difference(self._lastSignature, signature) > MOTION_DIFF_THRESHOLD:
+                self._keyframes.append(image)
+                self._lastSignature = signature
+        if self._taken < self.sampleCount:
+            wx.CallLater(self.intervalMs, self._sample)
+            return
+        keyframes = thin_keyframes(self._keyframes, MOTION_MAX_KEYFRAMES)
+        self._keyframes = []
+        log.info(f"Motion capture kept {len(keyframes)} keyframes from {self._taken} samples")
+        self.onDone(keyframes)
+
 def is_whatsapp_window():
     """Check if the current window is WhatsApp (handles both desktop and Store versions)."""
     try:
@@ -409,14 +2376,33 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
     
     def __init__(self):
         super(GlobalPlugin, self).__init__()
+        # The last described image, for follow-up questions
+        self._conversation = None
+        self._captureHistory = CaptureHistory()
         # Initialize the configuration
         config.conf.spec['WhatsAppImageDescription'] = SPEC
         
-        # Set default model if not already set
-        if not config.conf['WhatsAppImageDescription']['selectedModel']:
-            service = config.conf['WhatsAppImageDescription']['apiService']
-            if service in MODEL_OPTIONS and MODEL_OPTIONS[service]:
-                config.conf['WhatsAppImageDescription']['selectedModel'] = MODEL_OPTIONS[service][0]
+        # Offer the models from the last listings until they are fetched again
+        if not MODEL_OPTIONS["openrouter"]:
+            MODEL_OPTIONS["openrouter"] = sorted(getCapabilities("openrouter"))
+        for listedService in ("openai", "claude"):
+            if getCapabilities(listedService):
+                MODEL_OPTIONS[listedService] = modelsByAge(getCapabilities(listedService))
+        
+        # Set default model if not already set, replacing a saved model that is no longer listed
+        service = config.conf['WhatsAppImageDescription']['apiService']
+        selectedModel = config.conf['WhatsAppImageDescription']['selectedModel']
+        if service in MODEL_OPTIONS and (not selectedModel or not isListedModel(service, selectedModel)):
+            model = defaultModel(service) if service != "openrouter" else (MODEL_OPTIONS[service] or [None])[0]
+            if model:
+                if selectedModel:
+                    log.info(f"{selectedModel} is no longer available, switching to {model}")
+                config.conf['WhatsAppImageDescription']['selectedModel'] = model
+        
+        # Refresh a stale listing of the selected provider in the background
+        age = capabilityIndexAge(service) if service in ("openai", "claude") else None
+        if service in ("openai", "claude") and (age is None or age > CAPABILITY_INDEX_MAX_AGE):
+            threading.Thread(target=fetchProviderModels, args=(service,), daemon=True).start()
         
         # Add settings panel
         settingsDialogs.NVDASettingsDialog.categoryClasses.append(WhatsAppImageDescriptionSettingsPanel)
@@ -426,14 +2412,173 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             settingsDialogs.NVDASettingsDialog.categoryClasses.remove(WhatsAppImageDescriptionSettingsPanel)
         except ValueError:
             pass
+        destroyDescriptionWindow()
+        descriptionPacks.close()
+        if self._conversation:
+            self._conversation.close(wait=True)
         super(GlobalPlugin, self).terminate()
     
     @script(description="Describe the image in the current WhatsApp message", gesture="kb:ALT+I")
+    @measureMainThread
     def script_describeImage(self, gesture):
+        recording = CaptureRecording() if config.conf['WhatsAppImageDescription']['recordCorpus'] else None
+        capture = self._prepareCapture("Analyzing image, please wait...", recording)
+        if not capture:
+            return
+        rect, hints = capture
+        try:
+            # Capture the screen region using wxPython's screenshot capability
+            start = time.perf_counter()
+            image = grab_wx_image(*rect)
+            if image is None:
+                ui.message("Failed to capture image, trying alternative method")
+                return
+            if recording:
+                recording.time("capture", time.perf_counter() - start)
+                
+            # Crop, encode and send the image in a separate thread to keep NVDA responsive
+            threading.Thread(
+                target=self._processCapture, 
+                args=(image, hints, recording)
+            ).start()
+                
+        except Exception as e:
+            log.error(f"Error capturing image: {e}")
+            ui.message(f"Error describing image: {str(e)}")
+    
+    @script(
+        description="Describe the motion in the GIF or video of the current WhatsApp message",
+        gesture="kb:ALT+SHIFT+I"
+    )
+    @measureMainThread
+    def script_describeMotion(self, gesture):
+        capture = self._prepareCapture("Sampling animation, please wait...")
+        if not capture:
+            return
+        rect, hints = capture
+        
+        def onKeyframes(keyframes):
+            if not keyframes:
+                ui.message("Failed to capture image, trying alternative method")
+                return
+            threading.Thread(target=self._processKeyframes, args=(keyframes, hints)).start()
+        
+        try:
+            MotionSampler(rect, onKeyframes).start()
+        except Exception as e:
+            log.error(f"Error sampling animation: {e}")
+            ui.message(f"Error describing image: {str(e)}")
+    
+    @script(description="Benchmark the latency of OpenRouter vision models")
+    @measureMainThread
+    def script_benchmarkModels(self, gesture):
+        apiKey = config.conf['WhatsAppImageDescription']['openrouterApiKey']
+        if not apiKey:
+            self._showApiKeyDialog()
+            return
+        models = [
+            model.strip()
+            for model in config.conf['WhatsAppImageDescription']['benchmarkModels'].split(",")
+            if model.strip()
+        ]
+        if not models:
+            selectedModel = config.conf['WhatsAppImageDescription']['selectedModel']
+            if config.conf['WhatsAppImageDescription']['apiService'] != "openrouter" or not selectedModel:
+                ui.message("Choose models to benchmark in the WhatsApp Image Description settings")
+                return
+            models = [selectedModel]
+        ui.message(f"Benchmarking {len(models)} models, please wait...")
+        threading.Thread(target=self._runBenchmark, args=(models, apiKey)).start()
+    
+    def _runBenchmark(self, models, apiKey):
+        """Run the model benchmark and show the leaderboard. Runs on a background thread."""
+        try:
+            leaderboard = runModelBenchmark(models, apiKey)
+            labels = rankModels(sorted(leaderboard), leaderboard)[1]
+            summary = "\n".join(labels)
+            wx.CallAfter(showDescription, summary, "Model Latency Benchmark", time.perf_counter())
+        except Exception as e:
+            log.error(f"Error benchmarking models: {e}")
+            wx.CallAfter(ui.message, f"Error benchmarking models: {e}")
+    
+    def _processCapture(self, image, hints, recording=None):
+        """Crop and encode a captured wx.Image, then describe it. Runs on a background thread."""
+        try:
+            if recording:
+                recording.image = image
+            start = time.perf_counter()
+            if config.conf['WhatsAppImageDescription']['autoCrop']:
+                image = crop_to_image_region(image, hints)
+            cropped = time.perf_counter()
+            image_data = encode_png(image)
+            if recording:
+                recording.time("crop", cropped - start)
+                recording.time("encode", time.perf_counter() - cropped)
+        except Exception as e:
+            log.error(f"Error preparing captured image: {e}")
+            wx.CallAfter(ui.message, f"Error describing image: {e}")
+            return
+        self._processImageWithAI([image_data], recording=recording)
+        if recording:
+            recording.save()
+    
+    def _processKeyframes(self, keyframes, hints):
+        """Crop and encode sampled keyframes, then describe them. Runs on a background thread.
+
+        The region found in the first keyframe is cropped from all of them, so the
+        frames stay aligned.
+        """
+        try:
+            if config.conf['WhatsAppImageDescription']['autoCrop']:
+                region = find_image_region(keyframes[0], hints)
+                if region is not None:
+                    keyframes = [image.GetSubImage(wx.Rect(*region)) for image in keyframes]
+            images = [encode_png(image) for image in keyframes]
+        except Exception as e:
+            log.error(f"Error preparing keyframes: {e}")
+            wx.CallAfter(ui.message, f"Error describing image: {e}")
+            return
+        self._processImageWithAI(images, len(images) > 1)
+    
+    def _imageHints(self, element, left, top, maxDepth=2, maxNodes=40):
+        """Collect bounds of image-like UIA descendants, relative to (left, top)."""
+        hints = []
+        pending = [(child, 1) for child in element.children]
+        visited = 0
+        while pending and visited < maxNodes:
+            child, depth = pending.pop(0)
+            visited += 1
+            try:
+                isImage = getattr(child, 'UIAAutomationId', None) in ["ImagePanel", "MediaCard", "MediaContainer"]
+                if not isImage and hasattr(controlTypes, 'Role'):
+                    isImage = child.role == controlTypes.Role.GRAPHIC
+                location = child.location
+                if isImage and location and location.width and location.height:
+                    hints.append((location.left - left, location.top - top, location.width, location.height))
+                if depth < maxDepth:
+                    pending.extend((grandchild, depth + 1) for grandchild in child.children)
+            except Exception as e:
+                log.debug(f"Skipping UIA element while looking for image bounds: {e}")
+        return hints
+    
+    @script(description=f"Profile the next {PROFILE_INVOCATION_COUNT} WhatsApp Image Description commands")
+    def script_profileNextInvocations(self, gesture):
+        watchdog.profileNext()
+        ui.message(f"Profiling the next {PROFILE_INVOCATION_COUNT} commands")
+    
+    def _prepareCapture(self, startMessage, recording=None):
+        """Locate the image in the focused message and make it visible for capture.
+
+        Returns ((left, top, width, height), hints) where hints are the bounds of
+        image-like UIA elements inside the rectangle, or None after telling the user
+        why nothing can be captured. A recording, if given, receives the UIA subtree,
+        the rectangle and the lookup and preparation times.
+        """
+        prepareStart = time.perf_counter()
         # Check if we're in WhatsApp (supports both regular and Store versions)
         if not is_whatsapp_window():
             ui.message("This command only works in WhatsApp")
-            return
+            return None
             
         # Check if we're on a message that contains an image
         obj = api.getFocusObject()
@@ -443,23 +2588,29 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         
         if obj.UIAAutomationId != "BubbleListItem":
             ui.message("Please navigate to a message first")
-            return
+            return None
         
         # Check if this message contains an image
+        lookupStart = time.perf_counter()
         imageElement = self._findImageInMessage(obj)
+        if recording:
+            recording.time("lookup", time.perf_counter() - lookupStart)
+            recording.recordTree(obj, imageElement)
         
         if not imageElement:
             ui.message("No image found in this message")
-            return
+            return None
         
-        ui.message("Analyzing image, please wait...")
+        ui.message(startMessage)
+        # Build the description window once the script returns so it is ready for the result
+        wx.CallAfter(getDescriptionWindow)
         
         # Capture the image with extra inspection
         try:
             # Let's check the position of what we're trying to capture
             if not imageElement.location or not imageElement.location.width or not imageElement.location.height:
                 ui.message("Cannot determine image location")
-                return
+                return None
                 
             left = imageElement.location.left
             top = imageElement.location.top
@@ -468,10 +2619,12 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             
             log.info(f"Image element position: left={left}, top={top}, width={width}, height={height}")
             
+            container = imageElement
             if width < 10 or height < 10:
                 ui.message("Image area too small, trying to find the actual image")
                 # Try to get the parent message which may have better coordinates
                 messageObj = obj
+                container = messageObj
                 left = messageObj.location.left
                 top = messageObj.location.top
                 width = messageObj.location.width
@@ -479,36 +2632,34 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 log.info(f"Using message bounds instead: left={left}, top={top}, width={width}, height={height}")
             
             # Ensure we have a reasonable capture area
-            if width > 50 and height > 50:
-                # Try moving the mouse over the image to ensure it's visible/activated
-                try:
-                    p = winUser.POINT(left + width // 2, top + height // 2)
-                    winUser.setCursorPos(p.x, p.y)
-                    time.sleep(0.2)  # Wait a bit for any hover effects to activate
-                except Exception as e:
-                    log.error(f"Error moving mouse: {e}")
-                
-                # Set focus to the image element to ensure it's visible
-                imageElement.setFocus()
-                time.sleep(0.3)  # Wait a moment for the focus to take effect
-                
-                # Capture the screen region using wxPython's screenshot capability
-                image_data = capture_wx_screenshot(left, top, width, height)
-                if not image_data:
-                    ui.message("Failed to capture image, trying alternative method")
-                    return
-                    
-                # Send image to AI service in a separate thread to keep NVDA responsive
-                threading.Thread(
-                    target=self._processImageWithAI, 
-                    args=(image_data,)
-                ).start()
-            else:
+            if width <= 50 or height <= 50:
                 ui.message("Image area too small to capture properly")
+                return None
+            
+            # Try moving the mouse over the image to ensure it's visible/activated
+            try:
+                p = winUser.POINT(left + width // 2, top + height // 2)
+                winUser.setCursorPos(p.x, p.y)
+                time.sleep(0.2)  # Wait a bit for any hover effects to activate
+            except Exception as e:
+                log.error(f"Error moving mouse: {e}")
+            
+            # Set focus to the image element to ensure it's visible
+            imageElement.setFocus()
+            time.sleep(0.3)  # Wait a moment for the focus to take effect
+            
+            hints = []
+            if config.conf['WhatsAppImageDescription']['autoCrop']:
+                hints = self._imageHints(container, left, top)
+            if recording:
+                recording.recordCapture((left, top, width, height), hints)
+                recording.time("prepare", time.perf_counter() - prepareStart)
+            return ((left, top, width, height), hints)
                 
         except Exception as e:
             log.error(f"Error capturing image: {e}")
             ui.message(f"Error describing image: {str(e)}")
+            return None
     
     def _findImageInMessage(self, messageObj):
         """Find an image element within a WhatsApp message."""
@@ -568,227 +2719,348 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             log.error(f"Error finding image element: {e}")
             return messageObj  # Return the message object as a fallback
     
-    def _processImageWithAI(self, image_data):
-        """Send the image to an AI service and get the description."""
+    def _processImageWithAI(self, images, sequence=False, overrides=None, recording=None):
+        """Send one or more images to an AI service and get the description.
+
+        images is a list of PNG data; sequence marks keyframes of an animation.
+        overrides may replace the configured "service", "model" and "language" when
+        re-describing a kept capture. New captures are added to the capture history.
+        A recording, if given, receives the provider round trip.
+        """
         try:
-            apiService = config.conf['WhatsAppImageDescription']['apiService']
+            overrides = overrides or {}
+            if not overrides:
+                self._captureHistory.add(images, sequence)
+            language = overrides.get("language") or config.conf['WhatsAppImageDescription']['language']
+            prompt = sequencePrompt(language) if sequence else describePrompt(language)
+            apiService = overrides.get("service") or config.conf['WhatsAppImageDescription']['apiService']
+            selectedModel = overrides.get("model")
+            if not selectedModel and apiService == config.conf['WhatsAppImageDescription']['apiService']:
+                selectedModel = config.conf['WhatsAppImageDescription']['selectedModel']
+            # A known image is described from the imported packs without any network call
+            fingerprint = None
+            if len(images) == 1 and not sequence:
+                try:
+                    fingerprint = image_fingerprint(images[0])
+                except Exception as e:
+                    log.error(f"Error fingerprinting image: {e}")
+                if fingerprint is not None and not overrides.get("service") and not overrides.get("model"):
+                    start = time.perf_counter()
+                    description = descriptionPacks.lookup(fingerprint, language)
+                    if description is not None:
+                        log.info(f"Description pack hit in {(time.perf_counter() - start) * 1000000:.0f} us")
+                        # Follow-up questions are about this image and go to the configured service
+                        try:
+                            model, notice = preflightRequest(apiService, selectedModel, images, prompt)
+                            conversation = Conversation(apiService, model, language, images, prompt, description, None, None)
+                        except PreflightError as e:
+                            log.info(f"No follow-up questions for the packed description: {e}")
+                            conversation = None
+                        self._setConversation(conversation)
+                        wx.CallAfter(
+                            showDescription, f"From a description pack: {description}",
+                            "Image Description from a Pack", time.perf_counter()
+                        )
+                        return
             
             # Get the appropriate API key based on the selected service
-            if apiService == "openai":
-                apiKey = config.conf['WhatsAppImageDescription']['openaiApiKey']
-                description = self._describeWithOpenAI(image_data, apiKey)
-            elif apiService == "openrouter":
-                apiKey = config.conf['WhatsAppImageDescription']['openrouterApiKey']
-                description = self._describeWithOpenRouter(image_data, apiKey)
-            elif apiService == "claude":
-                apiKey = config.conf['WhatsAppImageDescription']['claudeApiKey']
-                description = self._describeWithClaude(image_data, apiKey)
-            else:
-                description = "Unknown API service selected"
-                apiKey = ""
-            
+            apiKey = serviceApiKey(apiService)
             if not apiKey:
                 wx.CallAfter(self._showApiKeyDialog)
                 return
             
+            # Check the request against the capability index before uploading anything
+            try:
+                model, notice = preflightRequest(apiService, selectedModel, images, prompt)
+            except PreflightError as e:
+                log.info(f"Request rejected by preflight: {e}")
+                wx.CallAfter(ui.message, str(e))
+                return
+            if notice:
+                wx.CallAfter(ui.message, notice)
+            
+            requestStats.bytes = requestStats.seconds = None
+            try:
+                description = self._callService(apiService, apiKey, model, images, prompt)
+            except DescriptionError as e:
+                if recording:
+                    recording.recordProvider(apiService, model, str(e), ok=False)
+                wx.CallAfter(showDescription, str(e), "Image Description", time.perf_counter())
+                return
+            if recording:
+                recording.recordProvider(apiService, model, description)
+            
             # Show the description
             if description:
-                wx.CallAfter(lambda: TextWindow(
-                    description, 
-                    "Image Description", 
-                    readOnly=True
+                self._setConversation(Conversation(
+                    apiService, model, language, images, prompt, description,
+                    requestStats.bytes, requestStats.seconds
                 ))
+                if fingerprint is not None and config.conf['WhatsAppImageDescription']['collectPackDescriptions']:
+                    descriptionPacks.remember(fingerprint, language, description)
+                wx.CallAfter(showDescription, description, "Image Description", time.perf_counter())
             else:
                 wx.CallAfter(lambda: ui.message("Could not get image description"))
                 
         except Exception as e:
             log.error(f"Error processing image with AI: {e}")
-            wx.CallAfter(lambda: ui.message(f"Error getting description: {str(e)}"))
+            wx.CallAfter(ui.message, f"Error getting description: {e}")
+    
+    def _setConversation(self, conversation):
+        """Make conversation the one follow-up questions refer to, ending the previous one."""
+        previous, self._conversation = self._conversation, conversation
+        if previous:
+            previous.close()
     
-    def _describeWithOpenAI(self, image_data, api_key):
-        """Use OpenAI's Vision API to describe the image."""
+    def _callService(self, service, apiKey, model, images, prompt, history=None, fileIds=None):
+        """Send a request to the given service and return its answer.
+
+        Raises DescriptionError, with a message for the user, when there is no answer.
+        """
+        if service == "openai":
+            return self._describeWithOpenAI(images, apiKey, prompt, model, history)
+        elif service == "openrouter":
+            return self._describeWithOpenRouter(images, apiKey, prompt, model, history)
+        return self._describeWithClaude(images, apiKey, prompt, model, history, fileIds)
+    
+    @script(
+        description="Describe the last captured image again with another service, model or language",
+        gesture="kb:ALT+SHIFT+R"
+    )
+    @measureMainThread
+    def script_redescribeLastCapture(self, gesture):
+        if not self._captureHistory.latest():
+            ui.message("No recent capture to describe again")
+            return
+        wx.CallAfter(self._showRedescribeMenu)
+    
+    def _showRedescribeMenu(self):
+        """Pop up a menu of services, models and languages for the last capture."""
+        menu = wx.Menu()
+        currentService = config.conf['WhatsAppImageDescription']['apiService']
+        
+        def addChoice(parent, label, overrides):
+            item = parent.Append(wx.ID_ANY, label)
+            menu.Bind(wx.EVT_MENU, lambda evt: self._redescribe(overrides), item)
+        
+        for service, serviceName in SERVICE_NAMES.items():
+            if not serviceApiKey(service):
+                continue
+            models = MODEL_OPTIONS[service]
+            labels = models
+            if service == "openrouter":
+                models, labels = rankModels(models, loadLeaderboard())
+                models, labels = models[:RESUBMIT_OPENROUTER_MODELS], labels[:RESUBMIT_OPENROUTER_MODELS]
+            if not models:
+                continue
+            subMenu = wx.Menu()
+            for model, label in zip(models, labels):
+                addChoice(subMenu, label, {"service": service, "model": model})
+            menu.AppendSubMenu(subMenu, serviceName)
+        
+        languageMenu = wx.Menu()
+        for language in LANGUAGES:
+            addChoice(languageMenu, language, {"service": currentService, "language": language})
+        menu.AppendSubMenu(languageMenu, "Language")
+        
+        gui.mainFrame.prePopup()
+        gui.mainFrame.PopupMenu(menu)
+        gui.mainFrame.postPopup()
+        menu.Destroy()
+    
+    def _redescribe(self, overrides):
+        """Describe the most recent capture again with the given overrides."""
+        capture = self._captureHistory.latest()
+        if not capture:
+            return
+        ui.message("Analyzing image, please wait...")
+        threading.Thread(
+            target=self._processImageWithAI,
+            args=(capture["images"], capture["sequence"], overrides)
+        ).start()
+    
+    @script(description="Ask a follow-up question about the last described image", gesture="kb:ALT+SHIFT+Q")
+    @measureMainThread
+    def script_askFollowUp(self, gesture):
+        if not self._conversation:
+            ui.message("Describe an image first")
+            return
+        dialog = wx.TextEntryDialog(gui.mainFrame, "Question about the last image:", "Follow-up Question")
+        
+        def onResult(result):
+            question = dialog.GetValue().strip()
+            if result != wx.ID_OK or not question:
+                return
+            ui.message("Asking, please wait...")
+            threading.Thread(target=self._askFollowUp, args=(self._conversation, question)).start()
+        
+        gui.runScriptModalDialog(dialog, onResult)
+    
+    def _askFollowUp(self, conversation, question):
+        """Continue the conversation about the last image. Runs on a background thread."""
+        try:
+            apiKey = serviceApiKey(conversation.service)
+            if not apiKey:
+                wx.CallAfter(self._showApiKeyDialog)
+                return
+            requestStats.uploadBytes = requestStats.uploadSeconds = None
+            # Claude can refer to uploaded files, so the image is sent once more at most
+            if conversation.service == "claude" and conversation.fileIds is None:
+                conversation.fileIds = uploadClaudeFiles(conversation.images, apiKey)
+                # A newer image may have replaced the conversation during the upload
+                if conversation.closed:
+                    conversation.close()
+            
+            prompt = followUpPrompt(question, conversation.language)
+            try:
+                preflightRequest(
+                    conversation.service, conversation.model, conversation.images,
+                    "".join(turn["text"] for turn in conversation.turns) + prompt
+                )
+            except PreflightError as e:
+                log.info(f"Follow-up rejected by preflight: {e}")
+                wx.CallAfter(ui.message, str(e))
+                return
+            requestStats.bytes = requestStats.seconds = None
+            try:
+                answer = self._callService(
+                    conversation.service, apiKey, conversation.model, conversation.images,
+                    prompt, conversation.turns, conversation.fileIds
+                )
+            except DescriptionError as e:
+                wx.CallAfter(showDescription, str(e), "Follow-up", time.perf_counter())
+                return
+            upload = ""
+            if requestStats.uploadSeconds is not None:
+                upload = f" after uploading {requestStats.uploadBytes} bytes in {requestStats.uploadSeconds:.2f} s"
+            log.info(
+                f"Follow-up request: {requestStats.bytes} bytes in {requestStats.seconds} s{upload}; "
+                f"first request: {conversation.requestBytes} bytes in {conversation.requestSeconds} s"
+            )
+            if not answer:
+                wx.CallAfter(lambda: ui.message("Could not get an answer"))
+                return
+            conversation.addExchange(prompt, answer)
+            wx.CallAfter(showDescription, answer, "Follow-up", time.perf_counter())
+            
+        except Exception as e:
+            log.error(f"Error asking follow-up question: {e}")
+            wx.CallAfter(ui.message, f"Error getting answer: {e}")
+    
+    def _describeWithOpenAI(self, images, api_key, prompt=None, model=None, history=None):
+        """Use OpenAI's Vision API to describe the image.
+
+        history holds earlier turns about the same images when asking a follow-up question.
+        """
         try:
             if not api_key:
-                return "OpenAI API key not configured. Please add your API key in settings."
+                raise DescriptionError("OpenAI API key not configured. Please add your API key in settings.")
                 
-            # Convert image to base64
-            encoded_image = base64.b64encode(image_data).decode('utf-8')
-            
             headers = {
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {api_key}"
             }
             
-            model = config.conf['WhatsAppImageDescription']['selectedModel']
-            if not model or model not in MODEL_OPTIONS["openai"]:
-                model = MODEL_OPTIONS["openai"][0]
-            
             payload = {
                 "model": model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Describe this image in detail. If the image contain text, extract the exact text  from the image after a brief description. Use {config.conf['WhatsAppImageDescription']['language']} language."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{encoded_image}"
-                                }
-                            }
-                        ]
-                    }
-                ],
+                "messages": chatMessages(conversationTurns(history, prompt), len(images)),
                 "max_tokens": config.conf['WhatsAppImageDescription']['maxTokens']
             }
             
-            response = requests.post(
+            response_data = postJson(
                 "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
+                headers,
+                payload,
+                images
             )
             
-            response_data = response.json()
-            
             if 'error' in response_data:
-                return f"Error from OpenAI: {response_data['error']['message']}"
+                raise DescriptionError(f"Error from OpenAI: {response_data['error']['message']}")
             
             return response_data['choices'][0]['message']['content']
             
+        except DescriptionError:
+            raise
         except Exception as e:
             log.error(f"OpenAI API error: {e}")
-            return f"Error: {str(e)}"
+            raise DescriptionError(f"Error: {str(e)}")
     
-    def _describeWithOpenRouter(self, image_data, api_key):
-        """Use OpenRouter API to describe the image."""
+    def _describeWithOpenRouter(self, images, api_key, prompt=None, model=None, history=None):
+        """Use OpenRouter API to describe the image.
+
+        history holds earlier turns about the same images when asking a follow-up question.
+        """
         try:
             if not api_key:
-                return "OpenRouter API key not configured. Please add your API key in settings."
+                raise DescriptionError("OpenRouter API key not configured. Please add your API key in settings.")
                 
-            # Convert image to base64
-            encoded_image = base64.b64encode(image_data).decode('utf-8')
-            
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-                "HTTP-Referer": "https://github.com/jasonpython50/whatsappImageDescriber",
-                "X-Title": "WhatsApp Image Describer NVDA Add-on"
-            }
-            
-            model_name = config.conf['WhatsAppImageDescription']['selectedModel']
-            if not model_name or model_name not in MODEL_OPTIONS["openrouter"]:
-                model_name = MODEL_OPTIONS["openrouter"][0]
-            
-            # Check if force free variant is enabled
-            if config.conf['WhatsAppImageDescription']['openrouterForceFree']:
-                # Append :free suffix if not already present
-                if not model_name.endswith(":free"):
-                    model_name = f"{model_name}:free"
+            headers = openRouterHeaders(api_key)
             
             payload = {
-                "model": model_name,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Describe this image in detail. If the image contain text, extract the exact text  from the image after a brief description. Use {config.conf['WhatsAppImageDescription']['language']} language."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{encoded_image}"
-                                }
-                            }
-                        ]
-                    }
-                ],
+                "model": model,
+                "messages": chatMessages(conversationTurns(history, prompt), len(images)),
                 "max_tokens": config.conf['WhatsAppImageDescription']['maxTokens']
             }
             
-            response = requests.post(
+            response_data = postJson(
                 "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
+                headers,
+                payload,
+                images
             )
             
-            response_data = response.json()
-            
             if 'error' in response_data:
-                return f"Error from OpenRouter: {response_data['error']['message']}"
+                raise DescriptionError(f"Error from OpenRouter: {response_data['error']['message']}")
             
             return response_data['choices'][0]['message']['content']
             
+        except DescriptionError:
+            raise
         except Exception as e:
             log.error(f"OpenRouter API error: {e}")
-            return f"Error: {str(e)}"
+            raise DescriptionError(f"Error: {str(e)}")
     
-    def _describeWithClaude(self, image_data, api_key):
-        """Use Anthropic's Claude API to describe the image."""
+    def _describeWithClaude(self, images, api_key, prompt=None, model=None, history=None, fileIds=None):
+        """Use Anthropic's Claude API to describe the image.
+
+        history holds earlier turns about the same images when asking a follow-up question.
+        fileIds, when given, are Files API IDs used instead of sending the images again.
+        """
         try:
             if not api_key:
-                return "Claude API key not configured. Please add your API key in settings."
+                raise DescriptionError("Claude API key not configured. Please add your API key in settings.")
                 
-            # Convert image to base64
-            encoded_image = base64.b64encode(image_data).decode('utf-8')
-            
             headers = {
                 "Content-Type": "application/json",
                 "x-api-key": api_key,
                 "anthropic-version": "2023-06-01"
             }
-            
-            model_name = config.conf['WhatsAppImageDescription']['selectedModel']
-            if not model_name or model_name not in MODEL_OPTIONS["claude"]:
-                model_name = MODEL_OPTIONS["claude"][0]
+            if fileIds:
+                headers["anthropic-beta"] = CLAUDE_FILES_BETA
             
             payload = {
-                "model": model_name,
+                "model": model,
                 "max_tokens": config.conf['WhatsAppImageDescription']['maxTokens'],
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Describe this image in detail. If the image contain text, extract the exact text  from the image after a brief description. Use {config.conf['WhatsAppImageDescription']['language']} language."
-                            },
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/png",
-                                    "data": encoded_image
-                                }
-                            }
-                        ]
-                    }
-                ]
+                "messages": claudeMessages(conversationTurns(history, prompt), len(images), fileIds)
             }
             
-            response = requests.post(
+            response_data = postJson(
                 "https://api.anthropic.com/v1/messages",
-                headers=headers,
-                json=payload,
-                timeout=30
+                headers,
+                payload,
+                images
             )
             
-            response_data = response.json()
-            
             if 'error' in response_data:
-                return f"Error from Claude: {response_data['error']['message']}"
+                raise DescriptionError(f"Error from Claude: {response_data['error']['message']}")
             
             return response_data['content'][0]['text']
             
+        except DescriptionError:
+            raise
         except Exception as e:
             log.error(f"Claude API error: {e}")
-            return f"Error: {str(e)}"
+            raise DescriptionError(f"Error: {str(e)}")
     
     def _showApiKeyDialog(self):
         """Show a dialog to prompt for API key setup."""
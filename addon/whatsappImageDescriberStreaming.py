@@ -0,0 +1,104 @@
+# whatsappImageDescriberStreaming.py
+"""Streamed JSON request bodies shared by the add-on and its description daemon.
+
+Both build provider requests with StreamedJsonBody, so the daemon can be handed a
+payload with image markers and the raw images and send exactly what the add-on
+would have sent. This module only needs the standard library.
+"""
+import base64
+import json
+import re
+import secrets
+
+# Key of the marker written into request payloads where base64 image data belongs.
+# StreamedJsonBody swaps the marker for the encoded image while the body is being sent.
+IMAGE_SLOT_KEY = "$waidImage"
+
+
+def imagePlaceholder(index=0, prefix=""):
+    """Return the marker standing in for the base64 data of image number index.
+
+    The marker is a dict rather than text, so nothing a user types or a model
+    answers can be mistaken for it. prefix is written before the image data,
+    as in a data URL.
+    """
+    return {IMAGE_SLOT_KEY: index, "prefix": prefix}
+
+
+class StreamedJsonBody(object):
+    """A file-like JSON request body that base64 encodes images as it is read.
+
+    The payload is serialized once with image markers in it, each replaced by a
+    token holding a nonce made for this body, so only the markers placed by the
+    payload builders are ever swapped for image data. While the HTTP
+    layer reads the body, the images are encoded in small chunks and written
+    straight into the stream. Neither a full base64 copy of an image nor the
+    complete serialized body is ever held in memory. The exact length is known
+    in advance, so requests sends a normal Content-Length header rather than
+    chunked transfer encoding.
+    """
+
+    # A multiple of 3 so each chunk encodes without padding
+    CHUNK_SIZE = 48 * 1024
+
+    def __init__(self, payload, images):
+        self._images = images
+        self._segments = []
+        self.len = 0
+        nonce = secrets.token_hex(8)
+
+        def markSlots(value):
+            if isinstance(value, dict):
+                if IMAGE_SLOT_KEY in value:
+                    return f"{value['prefix']}@@{nonce}_{int(value[IMAGE_SLOT_KEY])}@@"
+                return {key: markSlots(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [markSlots(item) for item in value]
+            return value
+
+        parts = re.split(rf"@@{nonce}_(\d+)@@", json.dumps(markSlots(payload)))
+        # Even positions hold serialized JSON, odd positions hold image indexes
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                data = part.encode('utf-8')
+                if data:
+                    self._segments.append(data)
+                    self.len += len(data)
+            else:
+                index = int(part)
+                self._segments.append(index)
+                self.len += 4 * ((len(images[index]) + 2) // 3)
+        self._chunks = self._generateChunks()
+        self._pending = b""
+
+    def __len__(self):
+        return self.len
+
+    def __iter__(self):
+        return self._generateChunks()
+
+    def _generateChunks(self):
+        for segment in self._segments:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+            view = memoryview(self._images[segment])
+            for offset in range(0, len(view), self.CHUNK_SIZE):
+                yield base64.b64encode(view[offset:offset + self.CHUNK_SIZE])
+
+    def read(self, size=-1):
+        """Return up to size bytes of the body, or the rest of it if size is negative."""
+        pieces = [self._pending]
+        available = len(self._pending)
+        while size < 0 or available < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            pieces.append(chunk)
+            available += len(chunk)
+        data = b"".join(pieces)
+        if size < 0:
+            self._pending = b""
+            return data
+        self._pending = data[size:]
+        return data[:size]
@@ -0,0 +1,374 @@
+# replayCorpus.py
+"""Replay recorded captures through the add-on's pipeline to catch latency regressions.
+
+The add-on records captures when "Record captures for performance testing" is on in
+its settings. Each ALT+I then leaves a folder under recordings in the add-on's data
+directory holding recording.json (the scrubbed UIA subtree the image lookup walked,
+the capture rectangle, a settings snapshot, stage timings and the provider round
+trip) and capture.png (the pixelated capture).
+
+This script runs outside NVDA, on Windows or Linux, with wxPython and requests
+installed. It loads the add-on with stand-ins for the NVDA modules it imports and,
+for each recording, times:
+
+    lookup       _findImageInMessage over a rebuilt copy of the UIA subtree
+    crop         finding and cropping the image region
+    encode       PNG encoding of the cropped image
+    fingerprint  the description pack fingerprint
+    request      building and streaming the request to a local provider stand-in
+
+Recordings keep only a pixelated copy of each capture, so the crop, encode and
+fingerprint times are measured on that copy. Flat blocks crop and compress faster
+than real pictures, so these times are only comparable between replays of the same
+recordings, never with the times recorded on the user's machine.
+
+The stand-in answers like OpenAI, OpenRouter or Claude would, after the provider
+time that was recorded, or at once with --no-latency. Without a display, run it
+under xvfb-run.
+
+    python tools/replayCorpus.py RECORDINGS [--save results.json] [--baseline results.json]
+
+With --baseline, any stage whose median is more than --tolerance slower (and at
+least --min-ms slower) than in the baseline is reported and the exit status is 1.
+"""
+import argparse
+import enum
+import http.server
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import types
+import urllib.parse
+
+ADDON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "addon")
+PLUGIN_PATH = os.path.join(ADDON_DIR, "globalPlugins", "whatsappImageDescriber.py")
+STAGES = ["lookup", "crop", "encode", "fingerprint", "request"]
+PROVIDER_HOSTS = ["api.openai.com", "openrouter.ai", "api.anthropic.com"]
+CANNED_DESCRIPTION = "A replayed description."
+
+
+class Role(enum.Enum):
+    UNKNOWN = 0
+    GRAPHIC = 16
+    LIST = 14
+    LISTITEM = 15
+    GROUPING = 56
+    STATICTEXT = 7
+    BUTTON = 9
+    LINK = 19
+
+
+class ConfigSection(dict):
+    """A dict standing in for NVDA's config with a spec attribute."""
+
+    def __init__(self):
+        super().__init__()
+        self.spec = {}
+
+
+def installNvdaStandIns(configPath):
+    """Register modules named like NVDA's so the add-on can be imported outside NVDA."""
+    def module(name, **attributes):
+        mod = types.ModuleType(name)
+        mod.__dict__.update(attributes)
+        sys.modules[name] = mod
+        return mod
+
+    class GlobalPlugin(object):
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def terminate(self):
+            pass
+
+    class Log(object):
+        def _write(self, *args, **kwargs):
+            pass
+
+        debug = info = warning = debugWarning = _write
+
+        def error(self, message, *args, **kwargs):
+            print(f"add-on error: {message}", file=sys.stderr)
+
+        exception = error
+
+    class SettingsPanel(object):
+        pass
+
+    def script(**kwargs):
+        return lambda function: function
+
+    module("globalPluginHandler", GlobalPlugin=GlobalPlugin)
+    module("api", getFocusObject=lambda: None, getForegroundObject=lambda: None, getNavigatorObject=lambda: None)
+    module("ui", message=lambda text: None, browseableMessage=lambda *args, **kwargs: None)
+    module("scriptHandler", script=script, getLastScriptRepeatCount=lambda: 0)
+    module("config", conf=ConfigSection())
+    module("logHandler", log=Log())
+    module("controlTypes", Role=Role, ROLE_GRAPHIC=Role.GRAPHIC)
+    module("speech", cancelSpeech=lambda: None)
+    module("mouseHandler", executeMouseEvent=lambda *args: None)
+    module("winUser", setCursorPos=lambda *args: None, MOUSEEVENTF_LEFTDOWN=2, MOUSEEVENTF_LEFTUP=4)
+    module("globalVars", appArgs=types.SimpleNamespace(configPath=configPath))
+    settingsDialogs = module(
+        "gui.settingsDialogs",
+        SettingsPanel=SettingsPanel,
+        NVDASettingsDialog=types.SimpleNamespace(categoryClasses=[])
+    )
+    guiHelper = module("gui.guiHelper")
+    module(
+        "gui",
+        settingsDialogs=settingsDialogs,
+        guiHelper=guiHelper,
+        mainFrame=None,
+        messageBox=lambda *args, **kwargs: None
+    )
+
+
+def loadPlugin(configPath):
+    """Import the add-on's global plugin module from the source tree."""
+    installNvdaStandIns(configPath)
+    spec = importlib.util.spec_from_file_location("whatsappImageDescriber", PLUGIN_PATH)
+    plugin = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(plugin)
+    return plugin
+
+
+class ReplayedObject(object):
+    """An NVDAObject rebuilt from a recorded UIA node."""
+
+    def __init__(self, node, parent=None):
+        self.name = node.get("name", "")
+        self.UIAAutomationId = node.get("automationId")
+        self.role = Role[node["role"]] if node.get("role") in Role.__members__ else Role.UNKNOWN
+        location = node.get("location")
+        self.location = types.SimpleNamespace(
+            left=location[0], top=location[1], width=location[2], height=location[3]
+        ) if location else None
+        self.parent = parent
+        self.children = [ReplayedObject(child, self) for child in node.get("children", [])]
+        self.childCount = len(self.children)
+        self.firstChild = self.children[0] if self.children else None
+
+    def resolve(self, path):
+        node = self
+        for index in path:
+            node = node.children[index]
+        return node
+
+
+class ProviderStandIn(http.server.ThreadingHTTPServer):
+    """A local HTTP server that answers like the description providers."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ProviderHandler)
+        self.latency = 0.0
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class ProviderHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        # The body is read and discarded; the add-on logs how many bytes it sent
+        if "Content-Length" in self.headers:
+            remaining = int(self.headers["Content-Length"])
+            while remaining:
+                chunk = self.rfile.read(min(remaining, 65536))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+        else:
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                self.rfile.read(size + 2)
+                if not size:
+                    break
+        time.sleep(self.server.latency)
+        if self.path.endswith("/messages"):
+            answer = {"content": [{"type": "text", "text": CANNED_DESCRIPTION}]}
+        else:
+            answer = {"choices": [{"message": {"role": "assistant", "content": CANNED_DESCRIPTION}}]}
+        body = json.dumps(answer).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def redirectProviders(plugin, server):
+    """Point the add-on's provider requests at the stand-in server."""
+    import requests
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    post = requests.post
+
+    def redirectedPost(url, *args, **kwargs):
+        parts = urllib.parse.urlsplit(url)
+        if parts.hostname in PROVIDER_HOSTS:
+            url = base + parts.path
+        return post(url, *args, **kwargs)
+
+    plugin.requests = types.SimpleNamespace(**{
+        name: getattr(requests, name) for name in dir(requests) if not name.startswith("_")
+    })
+    plugin.requests.post = redirectedPost
+
+
+def loadRecordings(folder):
+    """Return (name, recording, folder) for each recording below folder, oldest first."""
+    recordings = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        if "recording.json" not in files:
+            continue
+        with open(os.path.join(root, "recording.json"), encoding="utf-8") as f:
+            recording = json.load(f)
+        if recording.get("version") != 1:
+            print(f"Skipping {root}: unsupported recording version", file=sys.stderr)
+            continue
+        recordings.append((os.path.relpath(root, folder), recording, root))
+    return recordings
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def replay(plugin, describer, server, name, recording, folder, args):
+    """Feed one recording through the pipeline and return its stage timings."""
+    import wx
+    plugin.config.conf["WhatsAppImageDescription"].update(recording["config"], useDaemon=False)
+    timings = {}
+    tree = recording.get("tree")
+    if tree:
+        message = ReplayedObject(tree)
+        found, timings["lookup"] = timed(describer._findImageInMessage, message)
+        path = recording.get("foundPath")
+        if path is not None and found is not message.resolve(path):
+            print(f"{name}: image lookup chose a different element than when recorded", file=sys.stderr)
+    capture = recording.get("capture")
+    if not capture:
+        return timings
+    image = wx.Image(os.path.join(folder, capture["file"]), wx.BITMAP_TYPE_PNG)
+    hints = [tuple(hint) for hint in recording.get("hints", [])]
+    if recording["config"].get("autoCrop"):
+        image, timings["crop"] = timed(plugin.crop_to_image_region, image, hints)
+    data, timings["encode"] = timed(plugin.encode_png, image)
+    timings["fingerprint"] = timed(plugin.image_fingerprint, data)[1]
+    provider = recording.get("provider")
+    if provider and not args.no_provider:
+        recorded = provider.get("seconds")
+        server.latency = 0.0 if args.no_latency or recorded is None else recorded
+        try:
+            seconds = timed(
+                describer._callService,
+                provider["service"], "replay", provider["model"], [data], plugin.describePrompt()
+            )[1]
+        except plugin.DescriptionError as e:
+            print(f"{name}: request failed: {e}", file=sys.stderr)
+            return timings
+        timings["request"] = seconds - server.latency
+    return timings
+
+
+def summarize(results):
+    """Return the median and maximum of each stage, in milliseconds."""
+    summary = {}
+    for stage in STAGES:
+        values = [timings[stage] * 1000 for timings in results.values() if stage in timings]
+        if values:
+            summary[stage] = {
+                "count": len(values),
+                "medianMs": round(statistics.median(values), 3),
+                "maxMs": round(max(values), 3)
+            }
+    return summary
+
+
+def regressions(summary, baseline, tolerance, minMs):
+    found = []
+    for stage, current in summary.items():
+        before = baseline.get(stage)
+        if not before:
+            continue
+        slower = current["medianMs"] - before["medianMs"]
+        if slower > minMs and current["medianMs"] > before["medianMs"] * (1 + tolerance):
+            found.append(f"{stage}: median {before['medianMs']:.2f} ms -> {current['medianMs']:.2f} ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded captures to catch latency regressions")
+    parser.add_argument("recordings", help="a recordings folder from the add-on's data directory")
+    parser.add_argument("--repeat", type=int, default=3, help="times to replay each recording; the fastest run counts")
+    parser.add_argument("--no-latency", action="store_true", help="answer provider requests at once")
+    parser.add_argument("--no-provider", action="store_true", help="skip the request stage")
+    parser.add_argument("--save", help="write the summary to this JSON file")
+    parser.add_argument("--baseline", help="compare against a summary written with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown (default 0.2)")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="ignore slowdowns smaller than this (default 2)")
+    args = parser.parse_args()
+
+    recordings = loadRecordings(args.recordings)
+    if not recordings:
+        sys.exit(f"No recordings found in {args.recordings}")
+
+    import wx
+    app = wx.App(False)
+    with tempfile.TemporaryDirectory() as configPath, ProviderStandIn() as server:
+        plugin = loadPlugin(configPath)
+        plugin.config.conf["WhatsAppImageDescription"] = {
+            key: None for key in plugin.SPEC
+        }
+        redirectProviders(plugin, server)
+        describer = plugin.GlobalPlugin.__new__(plugin.GlobalPlugin)
+        results = {}
+        for name, recording, folder in recordings:
+            runs = [replay(plugin, describer, server, name, recording, folder, args) for i in range(args.repeat)]
+            # A run that failed part way has no timings for the later stages
+            stages = dict.fromkeys(stage for run in runs for stage in run)
+            results[name] = {stage: min(run[stage] for run in runs if stage in run) for stage in stages}
+            print(name + "  " + "  ".join(
+                f"{stage} {seconds * 1000:.2f} ms" for stage, seconds in results[name].items()
+            ))
+    del app
+
+    summary = summarize(results)
+    print()
+    for stage, values in summary.items():
+        print(f"{stage:12} median {values['medianMs']:9.2f} ms  max {values['maxMs']:9.2f} ms  ({values['count']} recordings)")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=1)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            found = regressions(summary, json.load(f), args.tolerance, args.min_ms)
+        if found:
+            print("\nLatency regressions:")
+            for line in found:
+                print("  " + line)
+            sys.exit(1)
+        print("\nNo latency regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()